@@ -5,15 +5,23 @@ This dashboard provides comprehensive analysis for gas station conversion to hig
 with integrated forecasting visualizations and trend analysis.
 """
 
+# Use the non-interactive Agg backend; charts are only ever written to files
+import matplotlib
+matplotlib.use('Agg')
+
 import os
-import json
+import multiprocessing
 import random
+import hashlib
+import orjson
 import pandas as pd
 import numpy as np
 import folium
+import jinja2
 from folium import plugins
 import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import shutil
 
 # Create necessary folders if they don't exist
@@ -48,6 +56,273 @@ VIABILITY_WEIGHTS = {
     "parking_availability": 0.05
 }
 
+# orjson options for the JSON data files (numpy scalars are serialized natively)
+JSON_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+
+# Rows of the EV adoption projections table, rendered once at import
+EV_TABLE_HTML = "".join(f"<tr><td>{year}</td><td>{rate}%</td></tr>" for year, rate in EV_ADOPTION_PROJECTIONS.items())
+
+# Stylesheet embedded in the dashboard HTML
+DASHBOARD_CSS = """        :root {
+            --primary-color: #3498db;
+            --secondary-color: #2c3e50;
+            --success-color: #2ecc71;
+            --warning-color: #f39c12;
+            --danger-color: #e74c3c;
+            --light-color: #ecf0f1;
+            --dark-color: #2c3e50;
+        }
+        
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            margin: 0;
+            padding: 0;
+            background-color: #f5f7fa;
+            color: #333;
+        }
+        
+        .container {
+            max-width: 1400px;
+            margin: 0 auto;
+            padding: 20px;
+        }
+        
+        .dashboard-header {
+            background: linear-gradient(135deg, var(--primary-color), var(--secondary-color));
+            color: white;
+            padding: 20px 30px;
+            border-radius: 8px;
+            margin-bottom: 20px;
+            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+        }
+        
+        h1, h2, h3, h4 {
+            margin-top: 0;
+        }
+        
+        .stats-container {
+            display: flex;
+            flex-wrap: wrap;
+            gap: 20px;
+            margin-bottom: 20px;
+        }
+        
+        .stat-card {
+            background-color: white;
+            border-radius: 8px;
+            padding: 20px;
+            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
+            flex: 1;
+            min-width: 200px;
+            text-align: center;
+        }
+        
+        .stat-value {
+            font-size: 32px;
+            font-weight: bold;
+            margin: 10px 0;
+            color: var(--primary-color);
+        }
+        
+        .stat-label {
+            color: #666;
+            font-size: 14px;
+        }
+        
+        .content-grid {
+            display: grid;
+            grid-template-columns: 1fr 1fr;
+            gap: 20px;
+            margin-bottom: 20px;
+        }
+        
+        .content-box {
+            background-color: white;
+            border-radius: 8px;
+            padding: 20px;
+            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
+        }
+        
+        .station-list {
+            overflow-x: auto;
+        }
+        
+        table {
+            width: 100%;
+            border-collapse: collapse;
+            margin-top: 15px;
+        }
+        
+        th, td {
+            padding: 12px 15px;
+            text-align: left;
+            border-bottom: 1px solid #ddd;
+        }
+        
+        th {
+            background-color: var(--secondary-color);
+            color: white;
+            position: sticky;
+            top: 0;
+        }
+        
+        tr:hover {
+            background-color: #f9f9f9;
+        }
+        
+        .viability-high .viability-score {
+            color: var(--success-color);
+            font-weight: bold;
+        }
+        
+        .viability-medium .viability-score {
+            color: var(--warning-color);
+            font-weight: bold;
+        }
+        
+        .viability-low .viability-score {
+            color: var(--danger-color);
+            font-weight: bold;
+        }
+        
+        .map-container {
+            height: 500px;
+            border-radius: 8px;
+            overflow: hidden;
+        }
+        
+        iframe {
+            width: 100%;
+            height: 100%;
+            border: none;
+        }
+        
+        .forecasts-section {
+            margin-top: 40px;
+        }
+        
+        .forecast-grid {
+            display: flex;
+            flex-wrap: wrap;
+            gap: 20px;
+            margin-top: 20px;
+        }
+        
+        .forecast-card {
+            background-color: white;
+            border-radius: 8px;
+            padding: 20px;
+            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
+            flex: 1;
+            min-width: 400px;
+        }
+        
+        .forecast-metrics {
+            display: flex;
+            flex-wrap: wrap;
+            gap: 10px;
+            margin-bottom: 15px;
+        }
+        
+        .forecast-metric {
+            background-color: var(--light-color);
+            padding: 10px;
+            border-radius: 5px;
+            flex: 1;
+            min-width: 100px;
+            text-align: center;
+            font-size: 14px;
+        }
+        
+        .forecast-metric-value {
+            font-size: 20px;
+            font-weight: bold;
+            color: var(--primary-color);
+            margin-top: 5px;
+        }
+        
+        .forecast-plot {
+            width: 100%;
+            max-height: 300px;
+            object-fit: contain;
+            margin-top: 10px;
+        }
+        
+        .chart-box {
+            text-align: center;
+        }
+        
+        .chart-box img {
+            max-width: 100%;
+            margin-top: 15px;
+        }
+        
+        .additional-resources {
+            margin-top: 30px;
+            padding: 20px;
+            background-color: var(--light-color);
+            border-radius: 8px;
+        }
+        
+        footer {
+            text-align: center;
+            padding: 20px;
+            margin-top: 30px;
+            color: #666;
+            font-size: 14px;
+        }
+"""
+
+# Station popup layout, compiled once and rendered per station in create_map
+POPUP_TEMPLATE = jinja2.Template("""
+        <div style="font-family: Arial; min-width: 200px;">
+            <h3>{{ station.name }} ({{ station.station_id }})</h3>
+            <p><b>Viability Score:</b> {{ station.viability_score }}</p>
+            <p><b>Estimated ROI:</b> {{ station.estimated_roi }}%</p>
+            <p><b>Recommendation:</b> {{ station.recommendation }}</p>
+            <hr>
+            <h4>Key Factors:</h4>
+            <ul>
+                <li><b>Traffic Volume:</b> {{ station.features.traffic_volume }}</li>
+                <li><b>EV Ownership:</b> {{ station.features.ev_ownership }}</li>
+                <li><b>Grid Capacity:</b> {{ station.features.grid_capacity }}</li>
+            </ul>
+        </div>
+        """)
+
+# Leaflet callback used by FastMarkerCluster; each row is [lat, lon, popup, tooltip, color]
+STATION_MARKER_CALLBACK = """
+function (row) {
+    var icon = L.AwesomeMarkers.icon({icon: 'plug', prefix: 'fa', markerColor: row[4]});
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    marker.bindPopup(row[2], {maxWidth: 300});
+    marker.bindTooltip(row[3]);
+    return marker;
+}
+"""
+
+def _cache_key_path(save_file):
+    """Return the path of the hidden key file stored next to a generated output"""
+    directory, filename = os.path.split(save_file)
+    return os.path.join(directory, f".{os.path.splitext(filename)[0]}.key")
+
+def _content_key(df):
+    """Hash a DataFrame so unchanged inputs can be detected between runs"""
+    return hashlib.blake2b(pd.util.hash_pandas_object(df).values).hexdigest()
+
+def _output_is_current(save_file, key):
+    """Check whether save_file was already generated from inputs matching key"""
+    key_file = _cache_key_path(save_file)
+    if not (os.path.exists(save_file) and os.path.exists(key_file)):
+        return False
+    with open(key_file) as f:
+        return f.read().strip() == key
+
+def _store_output_key(save_file, key):
+    """Record the input key that save_file was generated from"""
+    with open(_cache_key_path(save_file), "w") as f:
+        f.write(key)
+
 def generate_gas_stations(num_stations=50, save_data=True):
     """
     Generate synthetic gas station data for analysis
@@ -57,47 +332,49 @@ def generate_gas_stations(num_stations=50, save_data=True):
         save_data (bool): Whether to save the data to files
         
     Returns:
-        list: List of station dictionaries
+        tuple: List of station dictionaries sorted by viability score, and the
+            matching feature matrix (one row per station, columns in LOCATION_FEATURES order)
     """
-    stations = []
+    rng = np.random.default_rng()
     
-    for i in range(1, num_stations + 1):
-        # Generate basic station info
-        station_id = f"GS-{i:04d}"
-        lat = 37.7749 + random.uniform(-0.5, 0.5)  # Around San Francisco
-        lon = -122.4194 + random.uniform(-0.5, 0.5)
-        
-        # Generate features with random values (0-100)
-        features = {feature: round(random.uniform(30, 95), 1) for feature in LOCATION_FEATURES}
-        
-        # Calculate viability score (weighted average of features)
-        viability_score = sum(features[k] * VIABILITY_WEIGHTS[k] for k in VIABILITY_WEIGHTS)
-        viability_score = round(viability_score, 1)
-        
-        # Calculate estimated ROI based on viability
-        roi = (viability_score / 100) * random.uniform(0.8, 1.2) * 25  # Max 30% ROI
-        roi = round(roi, 1)
-        
+    # Generate coordinates around San Francisco for all stations at once
+    lats = 37.7749 + rng.uniform(-0.5, 0.5, num_stations)
+    lons = -122.4194 + rng.uniform(-0.5, 0.5, num_stations)
+    
+    # Generate features with random values (30-95)
+    feature_matrix = rng.uniform(30, 95, (num_stations, len(LOCATION_FEATURES))).round(1)
+    
+    # Calculate viability score (weighted average of features)
+    weights = np.array([VIABILITY_WEIGHTS[k] for k in LOCATION_FEATURES])
+    viability_scores = (feature_matrix @ weights).round(1)
+    
+    # Calculate estimated ROI based on viability
+    rois = ((viability_scores / 100) * rng.uniform(0.8, 1.2, num_stations) * 25).round(1)  # Max 30% ROI
+    
+    # Sort stations by viability score (descending)
+    order = np.argsort(-viability_scores, kind="stable")
+    feature_matrix = feature_matrix[order]
+    
+    stations = []
+    for i, lat, lon, features, viability_score, roi in zip(
+        (order + 1).tolist(), lats[order].tolist(), lons[order].tolist(),
+        feature_matrix.tolist(), viability_scores[order].tolist(), rois[order].tolist()
+    ):
         # Determine conversion recommendation
         recommendation = "High Priority" if viability_score >= 70 else \
                         "Potential" if viability_score >= 50 else "Low Viability"
         
         # Create station object
-        station = {
-            "station_id": station_id,
+        stations.append({
+            "station_id": f"GS-{i:04d}",
             "name": f"Gas Station {i}",
             "latitude": lat,
             "longitude": lon,
-            "features": features,
+            "features": dict(zip(LOCATION_FEATURES, features)),
             "viability_score": viability_score,
             "estimated_roi": roi,
             "recommendation": recommendation
-        }
-        
-        stations.append(station)
-    
-    # Sort stations by viability score (descending)
-    stations.sort(key=lambda x: x["viability_score"], reverse=True)
+        })
     
     # Save data if requested
     if save_data:
@@ -118,10 +395,10 @@ def generate_gas_stations(num_stations=50, save_data=True):
         df.to_csv("data/gas_stations.csv", index=False)
         
         # Save as JSON for web usage
-        with open("data/gas_stations.json", "w") as f:
-            json.dump(stations, f, indent=2)
+        with open("data/gas_stations.json", "wb") as f:
+            f.write(orjson.dumps(stations, option=JSON_DUMP_OPTIONS))
     
-    return stations
+    return stations, feature_matrix
 
 def create_map(stations, save_file="output/station_map.html"):
     """
@@ -132,8 +409,13 @@ def create_map(stations, save_file="output/station_map.html"):
         save_file (str): Path to save the HTML file
         
     Returns:
-        folium.Map: Map object with stations
+        folium.Map: Map object with stations, or None if the saved map was reused
     """
+    # Reuse the existing map if it was generated from the same stations
+    key = _content_key(pd.json_normalize(stations))
+    if _output_is_current(save_file, key):
+        return None
+    
     # Calculate center of map
     lats = [s["latitude"] for s in stations]
     lons = [s["longitude"] for s in stations]
@@ -143,7 +425,8 @@ def create_map(stations, save_file="output/station_map.html"):
     # Create map
     m = folium.Map(location=[center_lat, center_lon], zoom_start=10)
     
-    # Add station markers
+    # Build one row per station; markers are created client-side by STATION_MARKER_CALLBACK
+    marker_rows = []
     for station in stations:
         # Determine marker color based on viability
         if station["viability_score"] >= 70:
@@ -154,32 +437,22 @@ def create_map(stations, save_file="output/station_map.html"):
             color = "red"
         
         # Create popup content
-        popup_content = f"""
-        <div style="font-family: Arial; min-width: 200px;">
-            <h3>{station["name"]} ({station["station_id"]})</h3>
-            <p><b>Viability Score:</b> {station["viability_score"]}</p>
-            <p><b>Estimated ROI:</b> {station["estimated_roi"]}%</p>
-            <p><b>Recommendation:</b> {station["recommendation"]}</p>
-            <hr>
-            <h4>Key Factors:</h4>
-            <ul>
-                <li><b>Traffic Volume:</b> {station["features"]["traffic_volume"]}</li>
-                <li><b>EV Ownership:</b> {station["features"]["ev_ownership"]}</li>
-                <li><b>Grid Capacity:</b> {station["features"]["grid_capacity"]}</li>
-            </ul>
-        </div>
-        """
-        
-        # Add marker
-        folium.Marker(
-            location=[station["latitude"], station["longitude"]],
-            popup=folium.Popup(popup_content, max_width=300),
-            tooltip=f"{station['name']} - Score: {station['viability_score']}",
-            icon=folium.Icon(color=color, icon="plug", prefix="fa")
-        ).add_to(m)
+        popup_content = POPUP_TEMPLATE.render(station=station)
+        
+        marker_rows.append([
+            station["latitude"],
+            station["longitude"],
+            popup_content,
+            f"{station['name']} - Score: {station['viability_score']}",
+            color
+        ])
+    
+    # Add all markers in a single layer
+    plugins.FastMarkerCluster(marker_rows, callback=STATION_MARKER_CALLBACK).add_to(m)
     
     # Save map
     m.save(save_file)
+    _store_output_key(save_file, key)
     
     return m
 
@@ -192,8 +465,13 @@ def create_heatmap(stations, save_file="output/ev_adoption_heatmap.html"):
         save_file (str): Path to save the HTML file
         
     Returns:
-        folium.Map: Map object with heatmap
+        folium.Map: Map object with heatmap, or None if the saved heatmap was reused
     """
+    # Reuse the existing heatmap if it was generated from the same stations
+    key = _content_key(pd.json_normalize(stations))
+    if _output_is_current(save_file, key):
+        return None
+    
     # Calculate center of map
     lats = [s["latitude"] for s in stations]
     lons = [s["longitude"] for s in stations]
@@ -223,6 +501,7 @@ def create_heatmap(stations, save_file="output/ev_adoption_heatmap.html"):
     
     # Save map
     m.save(save_file)
+    _store_output_key(save_file, key)
     
     return m
 
@@ -582,34 +861,39 @@ def analyze_forecast_trends(forecast_results):
     }
     
     # Save trends to JSON
-    with open('data/forecast_trends.json', 'w') as f:
-        json.dump(trends, f, indent=2)
+    with open('data/forecast_trends.json', 'wb') as f:
+        f.write(orjson.dumps(trends, option=JSON_DUMP_OPTIONS))
     
     return trends
 
-def calculate_dashboard_stats(stations):
+def calculate_dashboard_stats(stations, feature_matrix=None):
     """
     Calculate summary statistics for dashboard
     
     Args:
         stations (list): List of station dictionaries
+        feature_matrix (np.ndarray, optional): Feature matrix returned by generate_gas_stations;
+            rebuilt from the station dictionaries when not provided
         
     Returns:
         dict: Dictionary with calculated statistics
     """
+    scores = np.array([s["viability_score"] for s in stations])
+    rois = np.array([s["estimated_roi"] for s in stations])
+    if feature_matrix is None:
+        feature_matrix = np.array([[s["features"][f] for f in LOCATION_FEATURES] for s in stations])
+    
     # Calculate basic stats
     total_stations = len(stations)
-    avg_viability = round(sum(s["viability_score"] for s in stations) / total_stations, 1)
-    avg_roi = round(sum(s["estimated_roi"] for s in stations) / total_stations, 1)
+    avg_viability = round(float(scores.mean()), 1)
+    avg_roi = round(float(rois.mean()), 1)
     
     # Count stations by recommendation
-    high_viability = sum(1 for s in stations if s["viability_score"] >= 70)
-    low_viability = sum(1 for s in stations if s["viability_score"] < 50)
+    high_viability = int((scores >= 70).sum())
+    low_viability = int((scores < 50).sum())
     
-    # Calculate feature averages
-    feature_avgs = {}
-    for feature in LOCATION_FEATURES:
-        feature_avgs[feature] = round(sum(s["features"][feature] for s in stations) / total_stations, 1)
+    # Calculate feature averages in a single pass over the matrix
+    feature_avgs = dict(zip(LOCATION_FEATURES, feature_matrix.mean(axis=0).round(1).tolist()))
     
     return {
         "total_stations": total_stations,
@@ -620,6 +904,32 @@ def calculate_dashboard_stats(stations):
         "feature_averages": feature_avgs
     }
 
+def _forecast_one(job):
+    """
+    Generate the forecast for a single station inside a worker process
+    
+    Args:
+        job (tuple): Station ID, historical days, forecast days, base sessions and RNG seed
+        
+    Returns:
+        tuple: Forecast DataFrame, Plot path
+    """
+    station_id, historical_days, forecast_days, base_sessions, seed = job
+    
+    # Reseed so forked workers do not share the parent's random state
+    random.seed(seed)
+    np.random.seed(seed)
+    
+    _, forecast_df, plot_path = generate_forecast(
+        station_id,
+        historical_days=historical_days,
+        forecast_days=forecast_days,
+        base_sessions=base_sessions,
+        save_data=True
+    )
+    
+    return forecast_df, plot_path
+
 def generate_forecasts(stations, top_n=5, historical_days=180, forecast_days=90):
     """
     Generate time series forecasts for top stations
@@ -635,30 +945,32 @@ def generate_forecasts(stations, top_n=5, historical_days=180, forecast_days=90)
     """
     # Get top N stations by viability score
     top_stations = stations[:top_n]
+    station_ids = [station["station_id"] for station in top_stations]
+    
+    # Base sessions proportional to viability score, drawn for all stations at once
+    rng = np.random.default_rng()
+    scores = np.array([station["viability_score"] for station in top_stations])
+    base_sessions = (scores / 100) * rng.uniform(15, 25, len(top_stations))
+    seeds = rng.integers(0, 2**32, len(top_stations))
+    
+    # Generate forecasts for top stations in parallel; stations share no state
+    jobs = [
+        (station_id, historical_days, forecast_days, base, seed)
+        for station_id, base, seed in zip(station_ids, base_sessions.tolist(), seeds.tolist())
+    ]
+    # Spawn rather than fork: main() calls this while map threads are running
+    with ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn")) as executor:
+        results = list(executor.map(_forecast_one, jobs))
     
-    # Generate forecasts for top stations
-    forecast_results = {}
-    for station in top_stations:
-        station_id = station["station_id"]
-        
-        # Base sessions proportional to viability score
-        base_sessions = (station["viability_score"] / 100) * random.uniform(15, 25)
-        
-        # Generate forecast
-        historical_df, forecast_df, plot_path = generate_forecast(
-            station_id,
-            historical_days=historical_days,
-            forecast_days=forecast_days,
-            base_sessions=base_sessions,
-            save_data=True
-        )
-        
-        # Store forecast results
-        forecast_results[station_id] = (forecast_df, plot_path)
+    # Store forecast results
+    forecast_results = dict(zip(station_ids, results))
     
     # Analyze trends across stations
     trends = analyze_forecast_trends(forecast_results)
     
+    # Look up viability scores by station ID
+    score_by_id = {s["station_id"]: s["viability_score"] for s in stations}
+    
     # Create summary file with forecast results
     forecast_summary = {
         "date_generated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
@@ -667,7 +979,7 @@ def generate_forecasts(stations, top_n=5, historical_days=180, forecast_days=90)
         "overall_stats": trends["overall"],
         "station_forecasts": {
             station_id: {
-                "viability_score": next(s["viability_score"] for s in stations if s["station_id"] == station_id),
+                "viability_score": score_by_id[station_id],
                 "avg_sessions": round(forecast_df["charging_sessions"].mean(), 1),
                 "total_energy": round(forecast_df["energy_delivered_kwh"].sum(), 1),
                 "total_revenue": round(forecast_df["revenue_usd"].sum(), 2)
@@ -677,11 +989,28 @@ def generate_forecasts(stations, top_n=5, historical_days=180, forecast_days=90)
     }
     
     # Save forecast summary
-    with open("data/forecast_summary.json", "w") as f:
-        json.dump(forecast_summary, f, indent=2)
+    with open("data/forecast_summary.json", "wb") as f:
+        f.write(orjson.dumps(forecast_summary, option=JSON_DUMP_OPTIONS))
     
     return forecast_results
 
+# Figure reused by create_comparative_performance_chart across dashboard renders
+_comparative_fig = None
+
+def _comparative_figure():
+    """
+    Return the shared comparative chart figure with both axes cleared
+    
+    Returns:
+        tuple: Figure and its two axes
+    """
+    global _comparative_fig
+    if _comparative_fig is None:
+        _comparative_fig, _ = plt.subplots(1, 2, figsize=(14, 6))
+    for ax in _comparative_fig.axes:
+        ax.clear()
+    return _comparative_fig, _comparative_fig.axes
+
 def create_comparative_performance_chart(stations, forecast_results, save_file="output/forecasts/comparative_chart.png"):
     """
     Create chart comparing forecasted performance of top stations
@@ -697,6 +1026,11 @@ def create_comparative_performance_chart(stations, forecast_results, save_file="
     if not forecast_results:
         return None
     
+    # Reuse the existing chart if the forecasts have not changed
+    key = _content_key(pd.concat([forecast_df for forecast_df, _ in forecast_results.values()]))
+    if _output_is_current(save_file, key):
+        return save_file
+    
     # Extract station IDs and corresponding forecast data
     station_ids = []
     avg_sessions = []
@@ -707,35 +1041,40 @@ def create_comparative_performance_chart(stations, forecast_results, save_file="
         avg_sessions.append(round(forecast_df["charging_sessions"].mean(), 1))
         total_revenue.append(round(forecast_df["revenue_usd"].sum(), 2))
     
-    # Create figure with two subplots
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
-    
-    # Plot average daily sessions
-    colors1 = ['#2ecc71' if val >= 15 else '#f39c12' if val >= 10 else '#e74c3c' for val in avg_sessions]
-    ax1.bar(station_ids, avg_sessions, color=colors1)
-    ax1.set_title('Average Daily Charging Sessions', fontsize=14)
-    ax1.set_xlabel('Station ID', fontsize=12)
-    ax1.set_ylabel('Avg. Sessions per Day', fontsize=12)
-    ax1.grid(axis='y', linestyle='--', alpha=0.7)
-    
-    # Plot total revenue
-    colors2 = ['#2ecc71' if val >= 5000 else '#f39c12' if val >= 3000 else '#e74c3c' for val in total_revenue]
-    ax2.bar(station_ids, total_revenue, color=colors2)
-    ax2.set_title('Projected 90-Day Revenue', fontsize=14)
-    ax2.set_xlabel('Station ID', fontsize=12)
-    ax2.set_ylabel('Revenue (USD)', fontsize=12)
-    ax2.grid(axis='y', linestyle='--', alpha=0.7)
+    # Reuse the shared figure with two subplots
+    fig, (ax1, ax2) = _comparative_figure()
+    
+    # Color bars by performance band
+    avg = np.asarray(avg_sessions)
+    revenue = np.asarray(total_revenue)
+    colors1 = np.select([avg >= 15, avg >= 10], ['#2ecc71', '#f39c12'], '#e74c3c')
+    colors2 = np.select([revenue >= 5000, revenue >= 3000], ['#2ecc71', '#f39c12'], '#e74c3c')
+    
+    with plt.style.context("fast"):
+        # Plot average daily sessions
+        ax1.bar(station_ids, avg, color=colors1)
+        ax1.set_title('Average Daily Charging Sessions', fontsize=14)
+        ax1.set_xlabel('Station ID', fontsize=12)
+        ax1.set_ylabel('Avg. Sessions per Day', fontsize=12)
+        ax1.grid(axis='y', linestyle='--', alpha=0.7)
+        
+        # Plot total revenue
+        ax2.bar(station_ids, revenue, color=colors2)
+        ax2.set_title('Projected 90-Day Revenue', fontsize=14)
+        ax2.set_xlabel('Station ID', fontsize=12)
+        ax2.set_ylabel('Revenue (USD)', fontsize=12)
+        ax2.grid(axis='y', linestyle='--', alpha=0.7)
     
     # Add dollar signs to y-axis labels for revenue chart
     ax2.set_yticklabels(['${:,.0f}'.format(x) for x in ax2.get_yticks()])
     
     # Add title for the entire figure
     fig.suptitle('Comparative Forecasted Performance', fontsize=16)
-    plt.tight_layout(rect=[0, 0, 1, 0.95])  # Adjust layout to make room for suptitle
+    fig.tight_layout(rect=[0, 0, 1, 0.95])  # Adjust layout to make room for suptitle
     
-    # Save chart
-    plt.savefig(save_file)
-    plt.close()
+    # Save chart at thumbnail resolution; the figure stays open for the next render
+    fig.savefig(save_file, dpi=80, bbox_inches="tight", pil_kwargs={"optimize": True})
+    _store_output_key(save_file, key)
     
     return save_file
 
@@ -763,21 +1102,24 @@ def create_dashboard_html(stations, stats, forecast_results, save_file="output/d
     ev_years = list(EV_ADOPTION_PROJECTIONS.keys())
     ev_rates = list(EV_ADOPTION_PROJECTIONS.values())
     
-    # Generate station table rows
-    station_rows = ""
-    for i, station in enumerate(stations[:20]):  # Show top 20 stations
-        viability_class = "high" if station["viability_score"] >= 70 else "medium" if station["viability_score"] >= 50 else "low"
-        
-        station_rows += f"""
-        <tr class="viability-{viability_class}">
-            <td>{i+1}</td>
-            <td>{station["station_id"]}</td>
-            <td>{station["name"]}</td>
-            <td class="viability-score">{station["viability_score"]}</td>
-            <td>{station["estimated_roi"]}%</td>
-            <td>{station["recommendation"]}</td>
-        </tr>
-        """
+    # Generate station table rows for the top 20 stations
+    df_top = pd.DataFrame(stations[:20], columns=["station_id", "name", "viability_score", "estimated_roi", "recommendation"])
+    viability_class = np.select(
+        [df_top["viability_score"] >= 70, df_top["viability_score"] >= 50],
+        ["high", "medium"],
+        "low"
+    )
+    rows = (
+        '<tr class="viability-' + pd.Series(viability_class, index=df_top.index) + '">'
+        + "<td>" + pd.Series(df_top.index + 1, index=df_top.index).astype(str) + "</td>"
+        + "<td>" + df_top["station_id"] + "</td>"
+        + "<td>" + df_top["name"] + "</td>"
+        + '<td class="viability-score">' + df_top["viability_score"].astype(str) + "</td>"
+        + "<td>" + df_top["estimated_roi"].astype(str) + "%</td>"
+        + "<td>" + df_top["recommendation"] + "</td>"
+        + "</tr>\n"
+    )
+    station_rows = rows.str.cat()
     
     # Create HTML content
     html_content = f"""<!DOCTYPE html>
@@ -787,215 +1129,7 @@ def create_dashboard_html(stations, stats, forecast_results, save_file="output/d
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>HPC Station Conversion Dashboard</title>
     <style>
-        :root {{
-            --primary-color: #3498db;
-            --secondary-color: #2c3e50;
-            --success-color: #2ecc71;
-            --warning-color: #f39c12;
-            --danger-color: #e74c3c;
-            --light-color: #ecf0f1;
-            --dark-color: #2c3e50;
-        }}
-        
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            margin: 0;
-            padding: 0;
-            background-color: #f5f7fa;
-            color: #333;
-        }}
-        
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-        
-        .dashboard-header {{
-            background: linear-gradient(135deg, var(--primary-color), var(--secondary-color));
-            color: white;
-            padding: 20px 30px;
-            border-radius: 8px;
-            margin-bottom: 20px;
-            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        }}
-        
-        h1, h2, h3, h4 {{
-            margin-top: 0;
-        }}
-        
-        .stats-container {{
-            display: flex;
-            flex-wrap: wrap;
-            gap: 20px;
-            margin-bottom: 20px;
-        }}
-        
-        .stat-card {{
-            background-color: white;
-            border-radius: 8px;
-            padding: 20px;
-            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-            flex: 1;
-            min-width: 200px;
-            text-align: center;
-        }}
-        
-        .stat-value {{
-            font-size: 32px;
-            font-weight: bold;
-            margin: 10px 0;
-            color: var(--primary-color);
-        }}
-        
-        .stat-label {{
-            color: #666;
-            font-size: 14px;
-        }}
-        
-        .content-grid {{
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 20px;
-            margin-bottom: 20px;
-        }}
-        
-        .content-box {{
-            background-color: white;
-            border-radius: 8px;
-            padding: 20px;
-            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-        }}
-        
-        .station-list {{
-            overflow-x: auto;
-        }}
-        
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin-top: 15px;
-        }}
-        
-        th, td {{
-            padding: 12px 15px;
-            text-align: left;
-            border-bottom: 1px solid #ddd;
-        }}
-        
-        th {{
-            background-color: var(--secondary-color);
-            color: white;
-            position: sticky;
-            top: 0;
-        }}
-        
-        tr:hover {{
-            background-color: #f9f9f9;
-        }}
-        
-        .viability-high .viability-score {{
-            color: var(--success-color);
-            font-weight: bold;
-        }}
-        
-        .viability-medium .viability-score {{
-            color: var(--warning-color);
-            font-weight: bold;
-        }}
-        
-        .viability-low .viability-score {{
-            color: var(--danger-color);
-            font-weight: bold;
-        }}
-        
-        .map-container {{
-            height: 500px;
-            border-radius: 8px;
-            overflow: hidden;
-        }}
-        
-        iframe {{
-            width: 100%;
-            height: 100%;
-            border: none;
-        }}
-        
-        .forecasts-section {{
-            margin-top: 40px;
-        }}
-        
-        .forecast-grid {{
-            display: flex;
-            flex-wrap: wrap;
-            gap: 20px;
-            margin-top: 20px;
-        }}
-        
-        .forecast-card {{
-            background-color: white;
-            border-radius: 8px;
-            padding: 20px;
-            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-            flex: 1;
-            min-width: 400px;
-        }}
-        
-        .forecast-metrics {{
-            display: flex;
-            flex-wrap: wrap;
-            gap: 10px;
-            margin-bottom: 15px;
-        }}
-        
-        .forecast-metric {{
-            background-color: var(--light-color);
-            padding: 10px;
-            border-radius: 5px;
-            flex: 1;
-            min-width: 100px;
-            text-align: center;
-            font-size: 14px;
-        }}
-        
-        .forecast-metric-value {{
-            font-size: 20px;
-            font-weight: bold;
-            color: var(--primary-color);
-            margin-top: 5px;
-        }}
-        
-        .forecast-plot {{
-            width: 100%;
-            max-height: 300px;
-            object-fit: contain;
-            margin-top: 10px;
-        }}
-        
-        .chart-box {{
-            text-align: center;
-        }}
-        
-        .chart-box img {{
-            max-width: 100%;
-            margin-top: 15px;
-        }}
-        
-        .additional-resources {{
-            margin-top: 30px;
-            padding: 20px;
-            background-color: var(--light-color);
-            border-radius: 8px;
-        }}
-        
-        footer {{
-            text-align: center;
-            padding: 20px;
-            margin-top: 30px;
-            color: #666;
-            font-size: 14px;
-        }}
-    </style>
+{DASHBOARD_CSS}    </style>
 </head>
 <body>
     <div class="container">
@@ -1066,7 +1200,7 @@ def create_dashboard_html(stations, stats, forecast_results, save_file="output/d
                         </tr>
                     </thead>
                     <tbody>
-                        {"".join(f"<tr><td>{year}</td><td>{rate}%</td></tr>" for year, rate in EV_ADOPTION_PROJECTIONS.items())}
+                        {EV_TABLE_HTML}
                     </tbody>
                 </table>
             </div>
@@ -1115,25 +1249,27 @@ def main():
         os.makedirs(folder, exist_ok=True)
     
     print("Generating synthetic gas station data for analysis...")
-    stations = generate_gas_stations(num_stations=50, save_data=True)
+    stations, feature_matrix = generate_gas_stations(num_stations=50, save_data=True)
     print(f"Generated {len(stations)} stations for analysis")
     
-    print("Creating station map...")
-    create_map(stations, save_file="output/station_map.html")
-    print("Map saved to output/station_map.html")
-    
-    print("Creating EV adoption heatmap...")
-    create_heatmap(stations, save_file="output/ev_adoption_heatmap.html")
-    print("Heatmap saved to output/ev_adoption_heatmap.html")
-    
-    print("Calculating dashboard statistics...")
-    stats = calculate_dashboard_stats(stations)
-    print(f"Average viability score: {stats['avg_viability']}")
-    print(f"High viability stations: {stats['high_viability_count']}")
-    
-    print("Generating time series forecasts for top stations...")
-    forecast_results = generate_forecasts(stations, top_n=5)
-    print(f"Generated forecasts for {len(forecast_results)} stations")
+    # Map, heatmap and forecasts are independent, so generate them concurrently
+    print("Creating station map, EV adoption heatmap and time series forecasts for top stations...")
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        map_future = executor.submit(create_map, stations, save_file="output/station_map.html")
+        heatmap_future = executor.submit(create_heatmap, stations, save_file="output/ev_adoption_heatmap.html")
+        forecast_future = executor.submit(generate_forecasts, stations, top_n=5)
+        
+        print("Calculating dashboard statistics...")
+        stats = calculate_dashboard_stats(stations, feature_matrix)
+        print(f"Average viability score: {stats['avg_viability']}")
+        print(f"High viability stations: {stats['high_viability_count']}")
+        
+        map_future.result()
+        print("Map saved to output/station_map.html")
+        heatmap_future.result()
+        print("Heatmap saved to output/ev_adoption_heatmap.html")
+        forecast_results = forecast_future.result()
+        print(f"Generated forecasts for {len(forecast_results)} stations")
     
     print("Creating dashboard with forecast visualizations...")
     dashboard_file = create_dashboard_html(stations, stats, forecast_results)
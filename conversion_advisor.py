@@ -16,7 +16,7 @@ import matplotlib.pyplot as plt
 import requests
 from time_series_forecasting import generate_usage_data, forecast_station_usage
 from hpc_pricing_rl import HPCPricingEnv, evaluate_pricing_model
-from openai_config import OPENAI_API_KEY, OPENAI_API_TYPE, OPENAI_API_BASE, OPENAI_API_VERSION, OPENAI_DEPLOYMENT_NAME
+from openai_config import get_config, require_openai_api_key
 
 # Constants
 GAS_STATIONS_FILE = "data/gas_stations.csv"
@@ -161,13 +161,16 @@ def calculate_roi_metrics(scenarios, investment_tiers):
 def query_gpt4(prompt, max_tokens=1000):
     """Call Azure OpenAI API to generate recommendations"""
     # If no API key, return a placeholder response
-    if not OPENAI_API_KEY:
-        print("Warning: No OpenAI API key provided. Using placeholder recommendation.")
+    try:
+        api_key = require_openai_api_key()
+    except RuntimeError as e:
+        print(f"Warning: {e}. Using placeholder recommendation.")
         return generate_placeholder_recommendation()
+    config = get_config()
     
     headers = {
         "Content-Type": "application/json",
-        "api-key": OPENAI_API_KEY,
+        "api-key": api_key,
     }
     
     payload = {
@@ -178,7 +181,7 @@ def query_gpt4(prompt, max_tokens=1000):
     
     try:
         print("Calling Azure OpenAI API...")
-        endpoint = f"{OPENAI_API_BASE}openai/deployments/{OPENAI_DEPLOYMENT_NAME}/chat/completions?api-version={OPENAI_API_VERSION}"
+        endpoint = config.api_endpoint
         print(f"Endpoint: {endpoint}")
         
         response = requests.post(
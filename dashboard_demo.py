@@ -16,6 +16,7 @@ matplotlib.use('Agg')  # Non-interactive backend for server environments
 
 # Flask imports
 from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask_caching import Cache
 
 # Utils imports
 from utils.data_loader import DataLoader
@@ -40,10 +41,30 @@ app = Flask(__name__,
             static_folder='output',  # Serve files directly from output directory
             template_folder='templates')
 
+# Files under output/ are served by Flask's static route (send_from_directory with
+# conditional requests). Behind nginx/Apache, set USE_X_SENDFILE=1 so the proxy
+# streams the large folium HTML files with sendfile() instead of Python.
+app.config["USE_X_SENDFILE"] = os.environ.get("USE_X_SENDFILE", "").lower() in ("1", "true", "yes")
+
+# In-process cache for rendered pages that do not change between requests
+cache = Cache(app, config={"CACHE_TYPE": "SimpleCache"})
+
 # Create necessary directories
 for folder in ['data', 'config', 'output', 'output/forecasts', 'output/conversion_advisor', 'templates']:
     os.makedirs(folder, exist_ok=True)
 
+@app.after_request
+def add_cache_headers(response):
+    """Let browsers revalidate generated maps and charts instead of re-downloading them"""
+    if request.path.endswith(('.html', '.png')):
+        response.cache_control.public = True
+        response.cache_control.max_age = 3600
+        # Static files already carry an ETag and answer conditional requests
+        if 'ETag' not in response.headers and not response.direct_passthrough:
+            response.add_etag()
+            response = response.make_conditional(request)
+    return response
+
 # Routes
 @app.route('/')
 def index():
@@ -64,6 +85,7 @@ def index():
     return render_template('dashboard.html', data_counts=data_counts)
 
 @app.route('/conversion_advisor')
+@cache.memoize(timeout=300)
 def conversion_advisor_page():
     """Conversion advisor page"""
     stations_df = load_gas_stations()
@@ -77,6 +99,11 @@ def charging_patterns_page():
     analysis_results = run_analysis()
     return render_template('charging_patterns.html', results=analysis_results)
 
+@cache.memoize(timeout=300)
+def cached_conversion_recommendation(station_id):
+    """Generate a conversion recommendation, reusing recent results for the same station"""
+    return generate_conversion_recommendation(station_id)
+
 @app.route('/generate_recommendation')
 def generate_recommendation_api():
     """API endpoint for generating recommendations"""
@@ -89,7 +116,7 @@ def generate_recommendation_api():
         
         try:
             # Try to generate the actual recommendation
-            result = generate_conversion_recommendation(station_id)
+            result = cached_conversion_recommendation(station_id)
             dashboard_path = create_dashboard_html(result)
             
             # Extract the recommendation text
@@ -288,13 +315,13 @@ about limitations while still providing the most helpful response possible.
         ]
         
         try:
-            from openai_config import OPENAI_API_KEY, OPENAI_API_ENDPOINT
+            from openai_config import OPENAI_API_ENDPOINT, require_openai_api_key
             import requests
             
-            # Call Azure OpenAI API
+            # Call Azure OpenAI API; a missing key fails here rather than as a 401
             headers = {
                 "Content-Type": "application/json",
-                "api-key": OPENAI_API_KEY,
+                "api-key": require_openai_api_key(),
             }
             
             payload = {
@@ -1066,13 +1066,13 @@ about limitations while still providing the most helpful response possible.
         ]
         
         try:
-            from openai_config import OPENAI_API_KEY, OPENAI_API_ENDPOINT
+            from openai_config import OPENAI_API_ENDPOINT, require_openai_api_key
             import requests
             
-            # Call Azure OpenAI API
+            # Call Azure OpenAI API; a missing key fails here rather than as a 401
             headers = {
                 "Content-Type": "application/json",
-                "api-key": OPENAI_API_KEY,
+                "api-key": require_openai_api_key(),
             }
             
             payload = {
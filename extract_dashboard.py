@@ -1,17 +1,19 @@
-import json
+import ijson
 
-# Load the notebook
-with open('HPC Dashboard Collab (1).ipynb', 'r') as f:
-    notebook = json.load(f)
+MARKER = '%%writefile hpc_dashboard.py'
 
-# Find the cell with the dashboard code
-code_cells = [cell for cell in notebook['cells'] if cell['cell_type'] == 'code']
-for cell in code_cells:
-    source = ''.join(cell['source'])
-    if '%%writefile hpc_dashboard.py' in source:
-        dashboard_code = source.replace('%%writefile hpc_dashboard.py', '').strip()
+# Stream the notebook cell by cell and stop at the cell with the dashboard code
+with open('HPC Dashboard Collab (1).ipynb', 'rb') as notebook:
+    for cell in ijson.items(notebook, 'cells.item'):
+        if cell['cell_type'] != 'code':
+            continue
+        # The marker never spans lines, so check lines before joining the source
+        if not any(MARKER in line for line in cell['source']):
+            continue
+        source = ''.join(cell['source'])
+        dashboard_code = source.replace(MARKER, '').strip()
         # Write to file
         with open('hpc_dashboard.py', 'w') as f:
             f.write(dashboard_code)
         print('Created hpc_dashboard.py')
-        break 
\ No newline at end of file
+        break
\ No newline at end of file
@@ -1,31 +1,24 @@
-import json
+import ijson
 import re
 
-# Load the notebook
-with open('HPC Dashboard Collab (1).ipynb', 'r') as f:
-    notebook = json.load(f)
+SHEBANG = "#!/usr/bin/env python3"
+PART_PATTERN = re.compile(r"# HPC_integration_part([123])\.py")
 
-# Find cells with integration scripts
-code_cells = [cell for cell in notebook['cells'] if cell['cell_type'] == 'code']
-
-# Extract the script parts
-for i, cell in enumerate(code_cells):
-    source = ''.join(cell['source'])
-    
-    # Check for HPC_integration_part1.py
-    if "#!/usr/bin/env python3" in source and "# HPC_integration_part1.py" in source:
-        with open('HPC_integration_part1.py', 'w') as f:
-            f.write(source)
-        print('Created HPC_integration_part1.py')
-    
-    # Check for HPC_integration_part2.py
-    elif "#!/usr/bin/env python3" in source and "# HPC_integration_part2.py" in source:
-        with open('HPC_integration_part2.py', 'w') as f:
-            f.write(source)
-        print('Created HPC_integration_part2.py')
-    
-    # Check for HPC_integration_part3.py
-    elif "#!/usr/bin/env python3" in source and "# HPC_integration_part3.py" in source:
-        with open('HPC_integration_part3.py', 'w') as f:
-            f.write(source)
-        print('Created HPC_integration_part3.py') 
\ No newline at end of file
+# Stream the notebook cell by cell and extract the script parts
+with open('HPC Dashboard Collab (1).ipynb', 'rb') as notebook:
+    for cell in ijson.items(notebook, 'cells.item'):
+        if cell['cell_type'] != 'code':
+            continue
+        
+        # Integration scripts carry the shebang on line 1 and the part marker on line 2
+        lines = cell['source']
+        if not lines or not lines[0].startswith(SHEBANG):
+            continue
+        match = PART_PATTERN.search(lines[1] if len(lines) > 1 else "")
+        if match is None:
+            continue
+        
+        filename = f'HPC_integration_part{match.group(1)}.py'
+        with open(filename, 'w') as f:
+            f.write(''.join(lines))
+        print(f'Created {filename}')
\ No newline at end of file
@@ -5,11 +5,16 @@ This script is a simple command-line tool to generate visualizations for a speci
 """
 
 import argparse
+import contextlib
+import functools
+import multiprocessing
+import os
 import sys
-import subprocess
 
-def main():
-    """Main entry point for the location-based visualization generator"""
+from location_visualizer import run
+
+def _build_parser():
+    """Build the command line parser for the visualization generator"""
     # Set up argument parser
     parser = argparse.ArgumentParser(
         description='Generate EV charging pattern visualizations for a specific location',
@@ -20,7 +25,8 @@ def main():
     parser.add_argument(
         'location', 
         type=str, 
-        help='Location to analyze (city name, region, or station ID)'
+        nargs='+',
+        help='Location(s) to analyze (city name, region, or station ID)'
     )
     
     parser.add_argument(
@@ -29,37 +35,71 @@ def main():
         help='Display detailed progress information'
     )
     
+    return parser
+
+# Built once at import and reused by every call to get_args()
+_PARSER = _build_parser()
+
+@functools.lru_cache(maxsize=None)
+def _parse_args(argv):
+    """Parse a tuple of arguments; tuples are hashable so results can be cached"""
+    return _PARSER.parse_args(list(argv))
+
+def get_args(argv=None):
+    """Parse command line arguments, reusing the result for a repeated argument list
+    
+    Args:
+        argv (list, optional): Arguments to parse; defaults to sys.argv[1:]
+        
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    return _parse_args(tuple(sys.argv[1:] if argv is None else argv))
+
+def _run_location(location, verbose=False, parallel=True):
+    """Run the analysis for one location, hiding progress output unless verbose
+    
+    Returns:
+        int: Exit status for the location (0 on success); failures are reported
+            on stderr instead of being raised, so one location cannot abort a batch
+    """
+    # Without --verbose, progress output is discarded as it is written
+    # (stderr stays attached so errors are still shown)
+    with open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(sys.stdout if verbose else devnull):
+        try:
+            return run(location, verbose=verbose, parallel=parallel)
+        except Exception as e:
+            print(f"Error generating visualizations for {location}: {e}", file=sys.stderr)
+            return 1
+
+def main(argv=None):
+    """Main entry point for the location-based visualization generator"""
     # Parse arguments
-    args = parser.parse_args()
+    args = get_args(argv)
+    locations = args.location
     
-    if not args.location:
+    if not all(locations):
         print("Error: Location must be specified")
-        parser.print_help()
+        _PARSER.print_help()
         sys.exit(1)
     
-    # Run the analysis for the specified location
-    print(f"Generating visualizations for location: {args.location}")
-    try:
-        cmd = ["python3", "test_charging_patterns.py", "--location", args.location]
-        if args.verbose:
-            # The test script already has detailed output
-            pass
-            
-        print(f"Running: {' '.join(cmd)}")
-        result = subprocess.run(cmd, check=True, capture_output=not args.verbose)
-        
-        if not args.verbose:
-            print(f"Analysis for {args.location} completed successfully. Check output/charging_patterns/ for visualization files.")
-        
-    except subprocess.CalledProcessError as e:
-        print(f"Error generating visualizations: {e}")
-        if e.stdout:
-            print(f"Output: {e.stdout.decode('utf-8')}")
-        if e.stderr:
-            print(f"Error: {e.stderr.decode('utf-8')}")
-        sys.exit(1)
+    print(f"Generating visualizations for location: {', '.join(locations)}")
+    if len(locations) == 1:
+        # Run a single location in this process
+        return_codes = [_run_location(locations[0], args.verbose)]
+    else:
+        # One pool serves the whole batch, so each worker imports the analysis code once;
+        # pool workers are daemonic and cannot start their own chart processes
+        with multiprocessing.Pool(processes=min(len(locations), os.cpu_count() or 1)) as pool:
+            return_codes = pool.starmap(_run_location, [(location, args.verbose, False) for location in locations])
+    
+    if not args.verbose:
+        for location, rc in zip(locations, return_codes):
+            if rc == 0:
+                print(f"Analysis for {location} completed successfully. Check output/charging_patterns/ for visualization files.")
     
-    return 0
+    return max(return_codes)
 
 if __name__ == "__main__":
     sys.exit(main()) 
\ No newline at end of file
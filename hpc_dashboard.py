@@ -1,15 +1,29 @@
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Render off-screen; figures are only saved to PNG
 import matplotlib.pyplot as plt
 import seaborn as sns
 import folium
-from folium.plugins import HeatMap
+import jinja2
+import minify_html
+import rcssmin
+from PIL import Image
+from folium.plugins import HeatMap, FastMarkerCluster
 import json
 import os
+import base64
+import io
+import hashlib
+import gzip
+import shutil
+import functools
+import re
+import http.server
+from urllib.parse import urlsplit
 from IPython.display import display, HTML, IFrame
 import ipywidgets as widgets
 from datetime import datetime, timedelta
-import random
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -32,280 +46,182 @@ GREEN_ENERGY_COLORS = {
     'danger': '#f44336'        # Danger red
 }
 
-# Function to generate synthetic gas station data
-def generate_gas_station_data(n_stations=100):
-    """Generate synthetic gas station data with viability scores."""
-    # Define major cities with coordinates
-    cities = [
-        {"name": "New York", "lat": 40.7128, "lng": -74.0060},
-        {"name": "Los Angeles", "lat": 34.0522, "lng": -118.2437},
-        {"name": "Chicago", "lat": 41.8781, "lng": -87.6298},
-        {"name": "Houston", "lat": 29.7604, "lng": -95.3698},
-        {"name": "Phoenix", "lat": 33.4484, "lng": -112.0740},
-        {"name": "Philadelphia", "lat": 39.9526, "lng": -75.1652},
-        {"name": "San Antonio", "lat": 29.4241, "lng": -98.4936},
-        {"name": "San Diego", "lat": 32.7157, "lng": -117.1611},
-        {"name": "Dallas", "lat": 32.7767, "lng": -96.7970},
-        {"name": "San Francisco", "lat": 37.7749, "lng": -122.4194}
-    ]
-
-    # Station names and types
-    station_names = ["Shell", "Exxon", "BP", "Chevron", "Mobil", "Texaco", "Sunoco", "Valero", "Marathon", "Phillips 66"]
-    station_types = ["Highway", "Urban", "Suburban", "Rural"]
-
-    # Lists to store data
-    data = []
-
-    for i in range(n_stations):
-        # Select a random city
-        city = random.choice(cities)
-
-        # Create a small random offset to distribute stations around the city
-        lat_offset = (random.random() - 0.5) * 0.2
-        lng_offset = (random.random() - 0.5) * 0.2
-
-        # Generate random metrics for viability calculation
-        traffic_volume = random.randint(1000, 11000)  # 1000-11000 vehicles per day
-        ev_adoption_rate = random.uniform(0.05, 0.25)  # 5-25% EV adoption in area
-        competitor_distance = random.uniform(1, 16)  # 1-16 km to nearest competitor
-        land_size = random.uniform(500, 2500)  # 500-2500 sq meters
-        power_availability = random.uniform(0.2, 1.0)  # 20-100% power grid capacity
-
-        # Calculate viability score (0-100)
-        viability_score = (
-            (traffic_volume / 11000) * 30 +  # 30% weight to traffic
-            (ev_adoption_rate / 0.25) * 25 +  # 25% weight to EV adoption
-            (min(competitor_distance, 10) / 10) * 15 +  # 15% weight to competitor distance (capped at 10km)
-            (land_size / 2500) * 15 +  # 15% weight to land size
-            (power_availability) * 15  # 15% weight to power availability
-        )
-
-        viability_score = min(round(viability_score), 100)
-
-        # Determine station type based on location and traffic
-        station_type = random.choice(station_types)
-
-        # Calculate financial metrics
-        conversion_cost = round((1000000 - 200000 * (power_availability)) * (1 - land_size/5000) + 500000)
-        annual_revenue = round(traffic_volume * ev_adoption_rate * 5 * 365)  # Assuming $5 average per charging session
-        annual_operating_cost = round(annual_revenue * (0.4 + random.uniform(0, 0.2)))  # 40-60% of revenue
-        annual_profit = annual_revenue - annual_operating_cost
-        roi = round((annual_profit / conversion_cost) * 100 * 10) / 10
-        payback_period = round(conversion_cost / annual_profit * 10) / 10 if annual_profit > 0 else float('inf')
-
-        # Calculate solar potential
-        solar_potential = round(land_size * 0.1 * (0.7 + random.uniform(0, 0.3)))  # kWh per day
-        solar_installation_cost = round(solar_potential * 1000)  # $1000 per kWh capacity
-        solar_annual_savings = round(solar_potential * 365 * 0.15)  # 15 cents per kWh
-        solar_roi = round(solar_annual_savings / solar_installation_cost * 100 * 10) / 10
-        solar_payback = round(solar_installation_cost / solar_annual_savings * 10) / 10 if solar_annual_savings > 0 else float('inf')
-
-        # Store the data
-        data.append({
-            "id": f"station-{i+1}",
-            "name": f"{random.choice(station_names)} {city['name']} {i+1}",
-            "lat": city["lat"] + lat_offset,
-            "lng": city["lng"] + lng_offset,
-            "city": city["name"],
-            "type": station_type,
-            "traffic_volume": traffic_volume,
-            "ev_adoption_rate": round(ev_adoption_rate * 100),
-            "competitor_distance": round(competitor_distance * 10) / 10,
-            "land_size": round(land_size),
-            "power_availability": round(power_availability * 100),
-            "viability_score": viability_score,
-            "conversion_cost": conversion_cost,
-            "annual_revenue": annual_revenue,
-            "annual_operating_cost": annual_operating_cost,
-            "annual_profit": annual_profit,
-            "roi": roi,
-            "payback_period": payback_period,
-            "solar_potential": solar_potential,
-            "solar_installation_cost": solar_installation_cost,
-            "solar_annual_savings": solar_annual_savings,
-            "solar_roi": solar_roi,
-            "solar_payback": solar_payback,
-            "base_price": 0.40,  # $ per kWh
-            "peak_price": 0.55,  # $ per kWh during peak hours
-            "off_peak_price": 0.30,  # $ per kWh during off-peak
-            "estimated_revenue_increase": random.randint(10, 30)  # 10-30% increase with dynamic pricing
-        })
-
-    return pd.DataFrame(data)
+# Shared random generator for the synthetic data and pricing simulator
+_RNG = np.random.default_rng()
+
+# Major cities used to place synthetic stations, stored column-wise
+_CITY_NAMES = np.array(["New York", "Los Angeles", "Chicago", "Houston", "Phoenix",
+                        "Philadelphia", "San Antonio", "San Diego", "Dallas", "San Francisco"])
+_CITY_LATS = np.array([40.7128, 34.0522, 41.8781, 29.7604, 33.4484,
+                       39.9526, 29.4241, 32.7157, 32.7767, 37.7749])
+_CITY_LNGS = np.array([-74.0060, -118.2437, -87.6298, -95.3698, -112.0740,
+                       -75.1652, -98.4936, -117.1611, -96.7970, -122.4194])
+
+# Station names and types
+_STATION_NAMES = np.array(["Shell", "Exxon", "BP", "Chevron", "Mobil", "Texaco", "Sunoco", "Valero", "Marathon", "Phillips 66"])
+_STATION_TYPES = np.array(["Highway", "Urban", "Suburban", "Rural"])
+
+# Decimal places kept for map coordinates (about 10 cm)
+_COORD_PRECISION = 6
+
+# Directory holding built dashboards keyed by a hash of the station data
+_DASH_CACHE_DIR = '.dashcache'
+
+# Dashboard page template, compiled once and reused for every build
+_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+_TEMPLATE_ENV = jinja2.Environment(loader=jinja2.FileSystemLoader(_TEMPLATE_DIR), autoescape=True)
+_DASHBOARD_TEMPLATE = _TEMPLATE_ENV.get_template('hpc_dashboard.html')
+
+# Dashboard stylesheet, minified and versioned once at import
+with open(os.path.join(_TEMPLATE_DIR, 'hpc_dashboard.css'), encoding='utf-8') as _css_file:
+    _DASHBOARD_CSS = rcssmin.cssmin(_css_file.read())
+_DASHBOARD_CSS_VERSION = hashlib.blake2b(_DASHBOARD_CSS.encode('utf-8'), digest_size=4).hexdigest()
+_DASHBOARD_CSS_FILE = f'hpc_dashboard.{_DASHBOARD_CSS_VERSION}.css'
+
+# Files written by create_dashboard_html that a cached build relies on
+_DASH_OUTPUTS = ('hpc_dashboard.html', _DASHBOARD_CSS_FILE, 'hpc_dashboard_standalone.html.gz')
+
+# Content-hashed file names (name.<8 hex>.ext) never change once written
+_HASHED_ASSET = re.compile(r'\.([0-9a-f]{8})\.\w+$')
+
+# Popup shown for each station marker, precompiled once at import
+_POPUP_TEMPLATE = jinja2.Template("""
+    <div class="station-popup" style="font-family: Arial, sans-serif; width: 300px;">
+        <h3 style="margin-top: 0; border-bottom: 2px solid #00a67d; padding-bottom: 5px;">{{ name }}</h3>
+        <p><strong>Type:</strong> {{ type }}</p>
+        <p><strong>Viability Score:</strong> {{ viability_score }}/100</p>
+
+        <div class="popup-tabs" style="display: flex; border-bottom: 1px solid #ddd; margin: 15px 0 10px;">
+            <button data-tab="viability-{{ id }}" style="background: none; border: none; padding: 8px 15px; cursor: pointer; border-bottom: 3px solid #00a67d; font-weight: bold;">Viability</button>
+            <button data-tab="financial-{{ id }}" style="background: none; border: none; padding: 8px 15px; cursor: pointer; border-bottom: 3px solid transparent;">Financial</button>
+            <button data-tab="solar-{{ id }}" style="background: none; border: none; padding: 8px 15px; cursor: pointer; border-bottom: 3px solid transparent;">Solar</button>
+        </div>
 
-# Function to create an interactive map
-def create_interactive_map(df, center=[39.8283, -98.5795], zoom=4):
-    """Create an interactive map with gas stations colored by viability score."""
-    # Create a map centered on the US
-    m = folium.Map(location=center, zoom_start=zoom, tiles="OpenStreetMap")
-
-    # Define a color function based on viability score
-    def get_color(score):
-        if score >= 80:
-            return '#00a67d'  # Green for high viability
-        elif score >= 60:
-            return '#f7b733'  # Yellow for medium-high viability
-        elif score >= 40:
-            return '#ff9900'  # Orange for medium viability
-        else:
-            return '#f44336'  # Red for low viability
-
-    # Add markers for each gas station
-    for _, row in df.iterrows():
-        # Create popup content
-        popup_content = f"""
-        <div style="font-family: Arial, sans-serif; width: 300px;">
-            <h3 style="margin-top: 0; border-bottom: 2px solid #00a67d; padding-bottom: 5px;">{row['name']}</h3>
-            <p><strong>Type:</strong> {row['type']}</p>
-            <p><strong>Viability Score:</strong> {row['viability_score']}/100</p>
-
-            <div style="display: flex; border-bottom: 1px solid #ddd; margin: 15px 0 10px;">
-                <button onclick="showTab('viability-{row['id']}')" style="background: none; border: none; padding: 8px 15px; cursor: pointer; border-bottom: 3px solid #00a67d; font-weight: bold;">Viability</button>
-                <button onclick="showTab('financial-{row['id']}')" style="background: none; border: none; padding: 8px 15px; cursor: pointer; border-bottom: 3px solid transparent;">Financial</button>
-                <button onclick="showTab('solar-{row['id']}')" style="background: none; border: none; padding: 8px 15px; cursor: pointer; border-bottom: 3px solid transparent;">Solar</button>
-            </div>
-
-            <div id="viability-{row['id']}" class="tab-content" style="display: block;">
-                <h4 style="margin-top: 0;">Viability Factors</h4>
-                <table style="width: 100%; border-collapse: collapse;">
-                    <tr>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Traffic Volume:</td>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee;">{row['traffic_volume']:,} vehicles/day</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">EV Adoption Rate:</td>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee;">{row['ev_adoption_rate']}%</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Competitor Distance:</td>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee;">{row['competitor_distance']} km</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Land Size:</td>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee;">{row['land_size']} m²</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Power Availability:</td>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee;">{row['power_availability']}%</td>
-                    </tr>
-                </table>
-            </div>
-
-            <div id="financial-{row['id']}" class="tab-content" style="display: none;">
-                <h4 style="margin-top: 0;">Financial Analysis</h4>
-                <table style="width: 100%; border-collapse: collapse;">
-                    <tr>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Conversion Cost:</td>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee;">${row['conversion_cost']:,}</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Annual Revenue:</td>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee;">${row['annual_revenue']:,}</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Annual Operating Cost:</td>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee;">${row['annual_operating_cost']:,}</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Annual Profit:</td>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee;">${row['annual_profit']:,}</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">ROI:</td>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee;">{row['roi']}%</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Payback Period:</td>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee;">{row['payback_period']} years</td>
-                    </tr>
-                </table>
-            </div>
-
-            <div id="solar-{row['id']}" class="tab-content" style="display: none;">
-                <h4 style="margin-top: 0;">Solar Integration</h4>
-                <table style="width: 100%; border-collapse: collapse;">
-                    <tr>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Solar Potential:</td>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee;">{row['solar_potential']} kWh/day</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Installation Cost:</td>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee;">${row['solar_installation_cost']:,}</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Annual Savings:</td>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee;">${row['solar_annual_savings']:,}</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Solar ROI:</td>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee;">{row['solar_roi']}%</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Solar Payback Period:</td>
-                        <td style="padding: 5px; border-bottom: 1px solid #eee;">{row['solar_payback']} years</td>
-                    </tr>
-                </table>
-            </div>
-
-            <script>
-            function showTab(tabId) {
-                // Hide all tab contents
-                var tabContents = document.getElementsByClassName('tab-content');
-                for (var i = 0; i < tabContents.length; i++) {
-                    tabContents[i].style.display = 'none';
-                }
-
-                // Show the selected tab content
-                document.getElementById(tabId).style.display = 'block';
-
-                // Update button styles
-                var buttons = document.getElementsByTagName('button');
-                for (var i = 0; i < buttons.length; i++) {
-                    buttons[i].style.borderBottom = '3px solid transparent';
-                    buttons[i].style.fontWeight = 'normal';
-                }
-
-                // Highlight the active button
-                event.target.style.borderBottom = '3px solid #00a67d';
-                event.target.style.fontWeight = 'bold';
-            }
-            </script>
+        <div id="viability-{{ id }}" class="tab-content" style="display: block;">
+            <h4 style="margin-top: 0;">Viability Factors</h4>
+            <table style="width: 100%; border-collapse: collapse;">
+                <tr>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Traffic Volume:</td>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee;">{{ traffic_volume_fmt }} vehicles/day</td>
+                </tr>
+                <tr>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">EV Adoption Rate:</td>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee;">{{ ev_adoption_rate }}%</td>
+                </tr>
+                <tr>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Competitor Distance:</td>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee;">{{ competitor_distance }} km</td>
+                </tr>
+                <tr>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Land Size:</td>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee;">{{ land_size }} m²</td>
+                </tr>
+                <tr>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Power Availability:</td>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee;">{{ power_availability }}%</td>
+                </tr>
+            </table>
         </div>
-        """
-
-        # Create a custom icon
-        icon_html = f"""
-            <div style="background-color: {get_color(row['viability_score'])};
-                        width: 30px;
-                        height: 30px;
-                        border-radius: 15px;
-                        border: 2px solid white;
-                        display: flex;
-                        justify-content: center;
-                        align-items: center;
-                        font-weight: bold;
-                        color: white;
-                        box-shadow: 0 0 10px rgba(0,0,0,0.3);">
-                {row['viability_score']}
-            </div>
-        """
-
-        icon = folium.DivIcon(
-            html=icon_html,
-            icon_size=(30, 30),
-            icon_anchor=(15, 15)
-        )
-
-        # Add the marker to the map
-        folium.Marker(
-            location=[row['lat'], row['lng']],
-            popup=folium.Popup(popup_content, max_width=350),
-            icon=icon,
-            tooltip=f"{row['name']} (Score: {row['viability_score']})"
-        ).add_to(m)
 
-    # Add a legend
-    legend_html = '''
+        <div id="financial-{{ id }}" class="tab-content" style="display: none;">
+            <h4 style="margin-top: 0;">Financial Analysis</h4>
+            <table style="width: 100%; border-collapse: collapse;">
+                <tr>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Conversion Cost:</td>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee;">${{ conversion_cost_fmt }}</td>
+                </tr>
+                <tr>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Annual Revenue:</td>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee;">${{ annual_revenue_fmt }}</td>
+                </tr>
+                <tr>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Annual Operating Cost:</td>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee;">${{ annual_operating_cost_fmt }}</td>
+                </tr>
+                <tr>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Annual Profit:</td>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee;">${{ annual_profit_fmt }}</td>
+                </tr>
+                <tr>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">ROI:</td>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee;">{{ roi }}%</td>
+                </tr>
+                <tr>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Payback Period:</td>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee;">{{ payback_period }} years</td>
+                </tr>
+            </table>
+        </div>
+
+        <div id="solar-{{ id }}" class="tab-content" style="display: none;">
+            <h4 style="margin-top: 0;">Solar Integration</h4>
+            <table style="width: 100%; border-collapse: collapse;">
+                <tr>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Solar Potential:</td>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee;">{{ solar_potential }} kWh/day</td>
+                </tr>
+                <tr>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Installation Cost:</td>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee;">${{ solar_installation_cost_fmt }}</td>
+                </tr>
+                <tr>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Annual Savings:</td>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee;">${{ solar_annual_savings_fmt }}</td>
+                </tr>
+                <tr>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Solar ROI:</td>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee;">{{ solar_roi }}%</td>
+                </tr>
+                <tr>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee; font-weight: bold;">Solar Payback Period:</td>
+                    <td style="padding: 5px; border-bottom: 1px solid #eee;">{{ solar_payback }} years</td>
+                </tr>
+            </table>
+        </div>
+    </div>
+""", autoescape=True, undefined=jinja2.StrictUndefined)
+
+# Tab switcher for the popup buttons, added to the map page once. Popups are
+# created lazily by Leaflet, so a single delegated listener handles every one
+# and only touches the tabs of the popup that was clicked.
+_POPUP_SCRIPT = '''
+    <script>
+    document.addEventListener('click', function (e) {
+        var tab = e.target.closest('.popup-tabs [data-tab]');
+        if (!tab) return;
+        var popup = tab.closest('.station-popup');
+
+        popup.querySelectorAll('.popup-tabs [data-tab]').forEach(function (btn) {
+            var active = btn === tab;
+            btn.style.borderBottom = active ? '3px solid #00a67d' : '3px solid transparent';
+            btn.style.fontWeight = active ? 'bold' : 'normal';
+            popup.querySelector('#' + btn.dataset.tab).style.display = active ? 'block' : 'none';
+        });
+    });
+    </script>
+'''
+
+# Leaflet callback used by FastMarkerCluster; each row is [lat, lng, popup, tooltip, color, score]
+_MARKER_CALLBACK = """
+function (row) {
+    var icon = L.divIcon({
+        html: '<div style="background-color: ' + row[4] + '; width: 30px; height: 30px; ' +
+              'border-radius: 15px; border: 2px solid white; display: flex; ' +
+              'justify-content: center; align-items: center; font-weight: bold; ' +
+              'color: white; box-shadow: 0 0 10px rgba(0,0,0,0.3);">' + row[5] + '</div>',
+        className: '',
+        iconSize: [30, 30],
+        iconAnchor: [15, 15]
+    });
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    marker.bindPopup(row[2], {maxWidth: 350});
+    marker.bindTooltip(row[3]);
+    return marker;
+}
+"""
+
+# Map legends
+_VIABILITY_LEGEND_HTML = '''
     <div style="position: fixed;
                 bottom: 50px; right: 50px;
                 border: 2px solid grey;
@@ -332,26 +248,9 @@ def create_interactive_map(df, center=[39.8283, -98.5795], zoom=4):
             <span>0-39: Low</span>
         </div>
     </div>
-    '''
-
-    m.get_root().html.add_child(folium.Element(legend_html))
-
-    return m
-
-# Function to create a traffic heatmap
-def create_traffic_heatmap(df, center=[39.8283, -98.5795], zoom=4):
-    """Create a heatmap showing traffic volume at gas stations."""
-    # Create a map centered on the US
-    m = folium.Map(location=center, zoom_start=zoom, tiles="OpenStreetMap")
-
-    # Prepare data for heatmap
-    heat_data = [[row['lat'], row['lng'], row['traffic_volume'] / 1000] for _, row in df.iterrows()]
-
-    # Add heatmap layer
-    HeatMap(heat_data, radius=15, gradient={0.4: 'blue', 0.65: 'lime', 0.8: 'yellow', 1: 'red'}).add_to(m)
+'''
 
-    # Add a legend
-    legend_html = '''
+_TRAFFIC_LEGEND_HTML = '''
     <div style="position: fixed;
                 bottom: 50px; right: 50px;
                 border: 2px solid grey;
@@ -378,32 +277,243 @@ def create_traffic_heatmap(df, center=[39.8283, -98.5795], zoom=4):
             <span>Low Traffic</span>
         </div>
     </div>
-    '''
+'''
+
+# Function to generate synthetic gas station data
+def generate_gas_station_data(n_stations=100):
+    """Generate synthetic gas station data with viability scores."""
+    n = n_stations
+
+    # Select a random city for every station
+    city_idx = _RNG.integers(0, len(_CITY_NAMES), n)
+    city_name = _CITY_NAMES[city_idx]
+    city_lat = _CITY_LATS[city_idx]
+    city_lng = _CITY_LNGS[city_idx]
+
+    # Create a small random offset to distribute stations around the city
+    lat_offset = (_RNG.random(n) - 0.5) * 0.2
+    lng_offset = (_RNG.random(n) - 0.5) * 0.2
+
+    # Generate random metrics for viability calculation
+    traffic_volume = _RNG.integers(1000, 11001, n)  # 1000-11000 vehicles per day
+    ev_adoption_rate = _RNG.uniform(0.05, 0.25, n)  # 5-25% EV adoption in area
+    competitor_distance = _RNG.uniform(1, 16, n)  # 1-16 km to nearest competitor
+    land_size = _RNG.uniform(500, 2500, n)  # 500-2500 sq meters
+    power_availability = _RNG.uniform(0.2, 1.0, n)  # 20-100% power grid capacity
+
+    # Calculate viability score (0-100)
+    viability_score = (
+        (traffic_volume / 11000) * 30 +  # 30% weight to traffic
+        (ev_adoption_rate / 0.25) * 25 +  # 25% weight to EV adoption
+        (np.minimum(competitor_distance, 10) / 10) * 15 +  # 15% weight to competitor distance (capped at 10km)
+        (land_size / 2500) * 15 +  # 15% weight to land size
+        (power_availability) * 15  # 15% weight to power availability
+    )
+
+    viability_score = np.minimum(np.round(viability_score), 100).astype(np.int64)
+
+    # Determine station type based on location and traffic
+    station_type = _STATION_TYPES[_RNG.integers(0, len(_STATION_TYPES), n)]
+
+    # Calculate financial metrics
+    conversion_cost = np.round((1000000 - 200000 * (power_availability)) * (1 - land_size/5000) + 500000).astype(np.int64)
+    annual_revenue = np.round(traffic_volume * ev_adoption_rate * 5 * 365).astype(np.int64)  # Assuming $5 average per charging session
+    annual_operating_cost = np.round(annual_revenue * (0.4 + _RNG.uniform(0, 0.2, n))).astype(np.int64)  # 40-60% of revenue
+    annual_profit = annual_revenue - annual_operating_cost
+    roi = np.round((annual_profit / conversion_cost) * 100 * 10) / 10
+    with np.errstate(divide='ignore'):
+        payback_period = np.where(annual_profit > 0, np.round(conversion_cost / annual_profit * 10) / 10, np.inf)
+
+    # Calculate solar potential
+    solar_potential = np.round(land_size * 0.1 * (0.7 + _RNG.uniform(0, 0.3, n))).astype(np.int64)  # kWh per day
+    solar_installation_cost = solar_potential * 1000  # $1000 per kWh capacity
+    solar_annual_savings = np.round(solar_potential * 365 * 0.15).astype(np.int64)  # 15 cents per kWh
+    solar_roi = np.round(solar_annual_savings / solar_installation_cost * 100 * 10) / 10
+    with np.errstate(divide='ignore'):
+        solar_payback = np.where(solar_annual_savings > 0, np.round(solar_installation_cost / solar_annual_savings * 10) / 10, np.inf)
+
+    # Format the string columns only once all numeric work is done
+    brands = _STATION_NAMES[_RNG.integers(0, len(_STATION_NAMES), n)]
+    ids = [f"station-{i+1}" for i in range(n)]
+    names = [f"{brands[i]} {city_name[i]} {i+1}" for i in range(n)]
+
+    return pd.DataFrame({
+        "id": ids,
+        "name": names,
+        "lat": city_lat + lat_offset,
+        "lng": city_lng + lng_offset,
+        "city": city_name,
+        "type": station_type,
+        "traffic_volume": traffic_volume,
+        "ev_adoption_rate": np.round(ev_adoption_rate * 100).astype(np.int64),
+        "competitor_distance": np.round(competitor_distance * 10) / 10,
+        "land_size": np.round(land_size).astype(np.int64),
+        "power_availability": np.round(power_availability * 100).astype(np.int64),
+        "viability_score": viability_score,
+        "conversion_cost": conversion_cost,
+        "annual_revenue": annual_revenue,
+        "annual_operating_cost": annual_operating_cost,
+        "annual_profit": annual_profit,
+        "roi": roi,
+        "payback_period": payback_period,
+        "solar_potential": solar_potential,
+        "solar_installation_cost": solar_installation_cost,
+        "solar_annual_savings": solar_annual_savings,
+        "solar_roi": solar_roi,
+        "solar_payback": solar_payback,
+        "base_price": 0.40,  # $ per kWh
+        "peak_price": 0.55,  # $ per kWh during peak hours
+        "off_peak_price": 0.30,  # $ per kWh during off-peak
+        "estimated_revenue_increase": _RNG.integers(10, 31, n)  # 10-30% increase with dynamic pricing
+    })
+
+# Function to create the base map shared by all map views
+def _base_map(center=[39.8283, -98.5795], zoom=4):
+    """Create an empty map centered on the US."""
+    # Draw vector layers on a single canvas rather than one SVG node per feature
+    return folium.Map(location=center, zoom_start=zoom, tiles="OpenStreetMap", prefer_canvas=True)
+
+# Function to add viability markers to a map or layer
+def _add_station_markers(df, parent):
+    """Add gas station markers colored by viability score to parent."""
+    # Pull each needed column out once and walk them in parallel
+    fields = ['id', 'name', 'type', 'viability_score', 'traffic_volume', 'ev_adoption_rate',
+              'competitor_distance', 'land_size', 'power_availability', 'conversion_cost',
+              'annual_revenue', 'annual_operating_cost', 'annual_profit', 'roi', 'payback_period',
+              'solar_potential', 'solar_installation_cost', 'solar_annual_savings', 'solar_roi',
+              'solar_payback', 'lat', 'lng']
+    cols = [df[c].to_numpy() for c in fields]
+
+    # Trim coordinates so the serialized marker data stays compact
+    for c in ('lat', 'lng'):
+        i = fields.index(c)
+        cols[i] = np.round(cols[i], _COORD_PRECISION)
+
+    # Thousands-separated strings for the popup, formatted once per column
+    fmt_fields = ['traffic_volume', 'conversion_cost', 'annual_revenue', 'annual_operating_cost',
+                  'annual_profit', 'solar_installation_cost', 'solar_annual_savings']
+    fields = fields + [f"{c}_fmt" for c in fmt_fields]
+    cols += [df[c].map('{:,}'.format).to_numpy() for c in fmt_fields]
+
+    # Marker color based on viability score, for the whole column at once
+    score = df['viability_score'].to_numpy()
+    fields.append('color')
+    cols.append(np.select(
+        [score >= 80, score >= 60, score >= 40],
+        ['#00a67d', '#f7b733', '#ff9900'],  # Green, yellow, orange for high to medium viability
+        default='#f44336'  # Red for low viability
+    ))
+
+    # Build one row per station; markers are created client-side by _MARKER_CALLBACK
+    marker_rows = []
+    for vals in zip(*cols):
+        row = dict(zip(fields, vals))
+        marker_rows.append([
+            row['lat'],
+            row['lng'],
+            _POPUP_TEMPLATE.render(**row),
+            f"{row['name']} (Score: {row['viability_score']})",
+            row['color'],
+            int(row['viability_score'])
+        ])
+
+    # Add all markers in a single layer
+    FastMarkerCluster(marker_rows, callback=_MARKER_CALLBACK).add_to(parent)
+
+# Function to add the traffic heatmap to a map or layer
+def _add_traffic_heatmap(df, parent):
+    """Add a heatmap of traffic volume at gas stations to parent."""
+    # Prepare data for heatmap
+    heat_data = np.column_stack([df['lat'].to_numpy(), df['lng'].to_numpy(),
+                                 df['traffic_volume'].to_numpy() / 1000]).round(_COORD_PRECISION).tolist()
+
+    # Add heatmap layer
+    HeatMap(heat_data, radius=15, gradient={0.4: 'blue', 0.65: 'lime', 0.8: 'yellow', 1: 'red'}).add_to(parent)
+
+# Function to create an interactive map
+def create_interactive_map(df, center=[39.8283, -98.5795], zoom=4):
+    """Create an interactive map with gas stations colored by viability score."""
+    m = _base_map(center, zoom)
+    _add_station_markers(df, m)
 
-    m.get_root().html.add_child(folium.Element(legend_html))
+    # Add a legend
+    m.get_root().html.add_child(folium.Element(_VIABILITY_LEGEND_HTML))
+
+    # Add the popup tab script once for all markers
+    m.get_root().html.add_child(folium.Element(_POPUP_SCRIPT))
+
+    return m
+
+# Function to create a traffic heatmap
+def create_traffic_heatmap(df, center=[39.8283, -98.5795], zoom=4):
+    """Create a heatmap showing traffic volume at gas stations."""
+    m = _base_map(center, zoom)
+    _add_traffic_heatmap(df, m)
+
+    # Add a legend
+    m.get_root().html.add_child(folium.Element(_TRAFFIC_LEGEND_HTML))
 
     return m
 
+# Function to create a single map with both station layers
+def create_combined_map(df, center=[39.8283, -98.5795], zoom=4):
+    """Create one map with the viability markers and traffic heatmap as toggleable layers."""
+    m = _base_map(center, zoom)
+
+    viability_layer = folium.FeatureGroup(name="Station Viability")
+    _add_station_markers(df, viability_layer)
+    viability_layer.add_to(m)
+
+    traffic_layer = folium.FeatureGroup(name="Traffic Heatmap", show=False)
+    _add_traffic_heatmap(df, traffic_layer)
+    traffic_layer.add_to(m)
+
+    folium.LayerControl(collapsed=False).add_to(m)
+
+    # Add both legends, keeping the traffic one on the opposite side
+    m.get_root().html.add_child(folium.Element(_VIABILITY_LEGEND_HTML))
+    m.get_root().html.add_child(folium.Element(_TRAFFIC_LEGEND_HTML.replace('right: 50px', 'left: 50px')))
+
+    # Add the popup tab script once for all markers
+    m.get_root().html.add_child(folium.Element(_POPUP_SCRIPT))
+
+    return m
+
+# Function to write a text file with a precompressed copy
+def _write_with_gzip(path, text):
+    """Write text to path and a gzipped copy to path + '.gz' for static servers."""
+    # Encode once and hand the same bytes to both writers
+    data = text.encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(data)
+    with gzip.open(path + '.gz', 'wb', compresslevel=6) as f:
+        f.write(data)
+
+# Function to render a chart for the dashboard
+def _render_png(fig):
+    """Return fig rendered as PNG bytes without touching the disk."""
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=100, bbox_inches='tight', pil_kwargs={'compress_level': 1})
+    return buf.getvalue()
+
 # Function to create visualizations for dashboard
 def create_dashboard_visualizations(df):
-    """Create visualizations for the dashboard."""
+    """Create visualizations for the dashboard and return the figure with its PNG bytes."""
     # Set the style
     plt.style.use('ggplot')
     sns.set_palette([GREEN_ENERGY_COLORS['primary'], GREEN_ENERGY_COLORS['secondary'],
                      GREEN_ENERGY_COLORS['accent'], GREEN_ENERGY_COLORS['warning']])
 
     # Create a figure with subplots
-    fig = plt.figure(figsize=(20, 15))
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(20, 15))
 
     # 1. Viability Score Distribution
-    ax1 = plt.subplot(2, 2, 1)
-    sns.histplot(df['viability_score'], bins=10, kde=True, ax=ax1)
+    ax1.hist(df['viability_score'].to_numpy(), bins=10, color=GREEN_ENERGY_COLORS['primary'])
     ax1.set_title('Viability Score Distribution', fontsize=16)
     ax1.set_xlabel('Viability Score', fontsize=12)
     ax1.set_ylabel('Number of Stations', fontsize=12)
 
     # 2. ROI vs Viability Score
-    ax2 = plt.subplot(2, 2, 2)
     sns.scatterplot(x='viability_score', y='roi', data=df, hue='type', size='traffic_volume',
                    sizes=(50, 300), alpha=0.7, ax=ax2)
     ax2.set_title('ROI vs Viability Score', fontsize=16)
@@ -411,17 +521,16 @@ def create_dashboard_visualizations(df):
     ax2.set_ylabel('ROI (%)', fontsize=12)
 
     # 3. Payback Period by Station Type
-    ax3 = plt.subplot(2, 2, 3)
-    # Filter out infinite payback periods
-    df_finite = df[df['payback_period'] < 100]
-    sns.boxplot(x='type', y='payback_period', data=df_finite, ax=ax3)
+    # Filter out infinite payback periods without copying the frame
+    payback = df['payback_period'].to_numpy()
+    finite = np.isfinite(payback) & (payback < 100)
+    sns.boxplot(x=df['type'].to_numpy()[finite], y=payback[finite], ax=ax3)
     ax3.set_title('Payback Period by Station Type', fontsize=16)
     ax3.set_xlabel('Station Type', fontsize=12)
     ax3.set_ylabel('Payback Period (years)', fontsize=12)
 
     # 4. Traffic Volume vs EV Adoption Rate
-    ax4 = plt.subplot(2, 2, 4)
-    scatter = sns.scatterplot(x='traffic_volume', y='ev_adoption_rate', data=df,
+    sns.scatterplot(x='traffic_volume', y='ev_adoption_rate', data=df,
                              hue='viability_score', size='land_size', sizes=(50, 300),
                              palette='viridis', ax=ax4)
     ax4.set_title('Traffic Volume vs EV Adoption Rate', fontsize=16)
@@ -429,46 +538,51 @@ def create_dashboard_visualizations(df):
     ax4.set_ylabel('EV Adoption Rate (%)', fontsize=12)
 
     # Adjust layout
-    plt.tight_layout()
+    fig.tight_layout()
 
-    # Save the figure
-    plt.savefig('dashboard_visualizations.png', dpi=300, bbox_inches='tight')
+    # Render the chart in memory and release the figure from pyplot
+    png = _render_png(fig)
+    plt.close(fig)
 
-    return fig
+    return fig, png
 
-# Function to create EV adoption forecast
-def create_ev_forecast(base_year=2025, forecast_years=5, growth_rates=[5, 10, 15]):
-    """Create EV adoption forecast visualization."""
+# Function to render EV adoption forecast, once per parameter set
+@functools.lru_cache(maxsize=8)
+def _render_ev_forecast(base_year, forecast_years, growth_rates):
+    """Render the EV adoption forecast and return the figure with its PNG bytes."""
     years = list(range(base_year, base_year + forecast_years + 1))
 
     # Create a figure
-    plt.figure(figsize=(12, 8))
+    fig, ax = plt.subplots(figsize=(12, 8))
 
     # Plot different growth scenarios
     for rate in growth_rates:
-        # Starting from 10% adoption in base year
-        adoption = [10]
+        # Starting from 10% adoption in base year, compounded for each year
+        factors = np.concatenate(([1.0], np.full(forecast_years, 1 + rate/100)))
+        adoption = 10.0 * np.cumprod(factors)
 
-        # Calculate adoption for each year
-        for i in range(1, len(years)):
-            adoption.append(adoption[-1] * (1 + rate/100))
-
-        plt.plot(years, adoption, marker='o', linewidth=3, label=f"{rate}% Annual Growth")
+        ax.plot(years, adoption, marker='o', linewidth=3, label=f"{rate}% Annual Growth")
 
     # Add labels and title
-    plt.title('EV Adoption Rate Forecast', fontsize=18)
-    plt.xlabel('Year', fontsize=14)
-    plt.ylabel('EV Adoption Rate (%)', fontsize=14)
-    plt.grid(True, linestyle='--', alpha=0.7)
-    plt.legend(fontsize=12)
+    ax.set_title('EV Adoption Rate Forecast', fontsize=18)
+    ax.set_xlabel('Year', fontsize=14)
+    ax.set_ylabel('EV Adoption Rate (%)', fontsize=14)
+    ax.grid(True, linestyle='--', alpha=0.7)
+    ax.legend(fontsize=12)
 
     # Set y-axis to percentage
-    plt.gca().yaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f'{x:.0f}%'))
+    ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f'{x:.0f}%'))
+
+    # Render the chart once for these parameters and release the figure from pyplot
+    png = _render_png(fig)
+    plt.close(fig)
 
-    # Save the figure
-    plt.savefig('ev_forecast.png', dpi=300, bbox_inches='tight')
+    return fig, png
 
-    return plt.gcf()
+# Function to create EV adoption forecast
+def create_ev_forecast(base_year=2025, forecast_years=5, growth_rates=(5, 10, 15)):
+    """Create EV adoption forecast visualization and return the figure with its PNG bytes."""
+    return _render_ev_forecast(base_year, forecast_years, tuple(growth_rates))
 
 # Function to create dynamic pricing simulator
 def create_dynamic_pricing_simulator():
@@ -525,7 +639,7 @@ def create_dynamic_pricing_simulator():
         off_peak_price = base_price * (1 - peak_differential/100)
 
         # Simple model for revenue increase based on elasticity and price differential
-        revenue_increase = peak_differential * 0.5 + demand_elasticity * 0.3 + random.uniform(5, 15)
+        revenue_increase = peak_differential * 0.5 + demand_elasticity * 0.3 + _RNG.uniform(5, 15)
 
         with output:
             output.clear_output()
@@ -559,7 +673,10 @@ def create_dynamic_pricing_simulator():
 
 # Function to create scenario comparison
 def create_scenario_comparison(df):
-    """Create a scenario comparison visualization."""
+    """Create a scenario comparison visualization.
+
+    Returns the figure, the per-scenario results and the chart's PNG bytes.
+    """
     # Define scenarios
     scenarios = {
         'Base Case': {
@@ -589,43 +706,34 @@ def create_scenario_comparison(df):
         }
     }
 
-    # Calculate metrics for each scenario
-    results = {}
-
-    for name, params in scenarios.items():
-        # Copy the dataframe
-        scenario_df = df.copy()
-
-        # Apply EV growth
-        if params['ev_growth'] > 10:  # Base case is 10%
-            growth_factor = params['ev_growth'] / 10
-            scenario_df['annual_revenue'] = scenario_df['annual_revenue'] * growth_factor
-            scenario_df['annual_profit'] = scenario_df['annual_revenue'] - scenario_df['annual_operating_cost']
-
-        # Apply incentives
-        if params['incentive'] > 0:
-            incentive_factor = 1 - (params['incentive'] / 100)
-            scenario_df['conversion_cost'] = scenario_df['conversion_cost'] * incentive_factor
-
-        # Apply solar integration
-        if params['solar']:
-            scenario_df['annual_profit'] = scenario_df['annual_profit'] + scenario_df['solar_annual_savings']
-
-        # Recalculate ROI and payback period
-        scenario_df['roi'] = (scenario_df['annual_profit'] / scenario_df['conversion_cost']) * 100
-        scenario_df['payback_period'] = scenario_df['conversion_cost'] / scenario_df['annual_profit']
-
-        # Calculate metrics
-        results[name] = {
-            'avg_roi': scenario_df['roi'].mean(),
-            'avg_payback': scenario_df['payback_period'].mean(),
-            'total_investment': scenario_df['conversion_cost'].sum(),
-            'annual_profit': scenario_df['annual_profit'].sum(),
-            'viable_stations': sum(scenario_df['roi'] > 15)  # Stations with ROI > 15%
-        }
+    # Scenario parameters as column vectors so every scenario is computed in one pass
+    names = list(scenarios)
+    growth = np.array([max(p['ev_growth'], 10) / 10 for p in scenarios.values()])[:, None]  # Base case is 10%
+    incentive = np.array([1 - p['incentive'] / 100 for p in scenarios.values()])[:, None]
+    solar_on = np.array([p['solar'] for p in scenarios.values()], dtype=float)[:, None]
+
+    revenue = df['annual_revenue'].to_numpy(dtype=float)
+    operating_cost = df['annual_operating_cost'].to_numpy(dtype=float)
+    conversion_cost = df['conversion_cost'].to_numpy(dtype=float)
+    solar_savings = df['solar_annual_savings'].to_numpy(dtype=float)
+
+    # (scenarios, stations) arrays for EV growth, incentives and solar integration
+    profit = revenue * growth - operating_cost + solar_on * solar_savings
+    cost = conversion_cost * incentive
+
+    # Recalculate ROI and payback period
+    roi = (profit / cost) * 100
+    with np.errstate(divide='ignore'):
+        payback = cost / profit
 
     # Create a dataframe from results
-    results_df = pd.DataFrame(results).T
+    results_df = pd.DataFrame({
+        'avg_roi': roi.mean(axis=1),
+        'avg_payback': payback.mean(axis=1),
+        'total_investment': cost.sum(axis=1),
+        'annual_profit': profit.sum(axis=1),
+        'viable_stations': (roi > 15).sum(axis=1)  # Stations with ROI > 15%
+    }, index=names)
 
     # Create a figure
     fig, axes = plt.subplots(2, 2, figsize=(15, 12))
@@ -655,387 +763,213 @@ def create_scenario_comparison(df):
     axes[1, 1].tick_params(axis='x', rotation=45)
 
     # Adjust layout
-    plt.tight_layout()
-
-    # Save the figure
-    plt.savefig('scenario_comparison.png', dpi=300, bbox_inches='tight')
+    fig.tight_layout()
+
+    # Render the chart in memory and release the figure from pyplot
+    png = _render_png(fig)
+    plt.close(fig)
+
+    return fig, results_df, png
+
+# Function to publish the dashboard stylesheet
+def _write_dashboard_css(path=_DASHBOARD_CSS_FILE):
+    """Write the minified dashboard stylesheet under its content-hashed name and return that name."""
+    # The name carries the content hash, so an existing file is already up to date
+    if not os.path.exists(path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(_DASHBOARD_CSS)
+
+    return os.path.basename(path)
+
+# Function to inline an image in the dashboard
+def _embed_image(png, max_size=(1600, 1200)):
+    """Downscale the PNG bytes, re-encode them as WebP and return the data URI and size."""
+    with Image.open(io.BytesIO(png)) as img:
+        img.thumbnail(max_size, Image.LANCZOS)
+        buf = io.BytesIO()
+        img.save(buf, 'WEBP', quality=80, method=6)
+        width, height = img.size
+
+    return {
+        'src': 'data:image/webp;base64,' + base64.b64encode(buf.getvalue()).decode('ascii'),
+        'width': width,
+        'height': height
+    }
 
-    return fig, results_df
+# Function to shrink the rendered dashboard page
+def _minify_page(html):
+    """Collapse whitespace and comments in html, including in the inline CSS and JS."""
+    return minify_html.minify(html, minify_css=True, minify_js=True,
+                              keep_closing_tags=True, remove_processing_instructions=True)
+
+# Function to hash the station data for the dashboard cache
+def _dashboard_key(df):
+    """Return a content hash of df used to name cached dashboard builds."""
+    return hashlib.blake2b(pd.util.hash_pandas_object(df, index=True).values.tobytes(),
+                           digest_size=16).hexdigest()
+
+# Function to look up a previously built dashboard
+def _cached_dashboard(key):
+    """Return the cached dashboard HTML for key if its outputs are still on disk, else None."""
+    cache_path = os.path.join(_DASH_CACHE_DIR, f"{key}.html")
+    current_path = os.path.join(_DASH_CACHE_DIR, 'current')
+    if not (os.path.exists(cache_path) and os.path.exists(current_path)):
+        return None
+    if not all(os.path.exists(path) for path in _DASH_OUTPUTS):
+        return None
+
+    # The page on disk must come from the same data
+    with open(current_path) as f:
+        if f.read() != key:
+            return None
+    with open(cache_path, encoding='utf-8') as f:
+        return f.read()
 
 # Function to create a dashboard HTML
 def create_dashboard_html(df):
-    """Create an HTML dashboard with all visualizations."""
-    # Create visualizations
-    dashboard_viz = create_dashboard_visualizations(df)
-    ev_forecast_viz = create_ev_forecast()
-    scenario_fig, scenario_df = create_scenario_comparison(df)
-
-    # Create maps
-    station_map = create_interactive_map(df)
-    traffic_map = create_traffic_heatmap(df)
-
-    # Save maps as HTML
-    station_map.save('station_map.html')
-    traffic_map.save('traffic_map.html')
-
-    # Create HTML content
-    html_content = f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>HPC Station Conversion Dashboard</title>
-        <style>
-            :root {{
-                --primary-color: #00a67d;
-                --secondary-color: #0cc0df;
-                --accent-color: #f7b733;
-                --dark-bg: #0a2e36;
-                --light-bg: #f0f7f4;
-                --text-light: #ffffff;
-                --text-dark: #0a2e36;
-                --border-color: rgba(255, 255, 255, 0.2);
-                --card-bg: rgba(255, 255, 255, 0.1);
-                --success-color: #4caf50;
-                --warning-color: #ff9800;
-                --danger-color: #f44336;
-            }}
-
-            body {{
-                margin: 0;
-                padding: 0;
-                font-family: 'Poppins', -apple-system, BlinkMacSystemFont, 'Segoe UI', 'Roboto', 'Oxygen',
-                    'Ubuntu', 'Cantarell', 'Fira Sans', 'Droid Sans', 'Helvetica Neue', sans-serif;
-                -webkit-font-smoothing: antialiased;
-                -moz-osx-font-smoothing: grayscale;
-                background: var(--dark-bg);
-                color: var(--text-light);
-                overflow-x: hidden;
-            }}
-
-            .container {{
-                max-width: 1200px;
-                margin: 0 auto;
-                padding: 20px;
-            }}
-
-            header {{
-                text-align: center;
-                margin-bottom: 30px;
-                padding: 20px;
-                background: linear-gradient(135deg, rgba(0, 166, 125, 0.1) 0%, rgba(12, 192, 223, 0.1) 100%);
-                border-radius: 10px;
-                border: 1px solid var(--border-color);
-            }}
-
-            h1 {{
-                font-size: 2.5rem;
-                margin: 0;
-                background: linear-gradient(90deg, var(--primary-color), var(--secondary-color));
-                -webkit-background-clip: text;
-                -webkit-text-fill-color: transparent;
-            }}
-
-            h2 {{
-                font-size: 1.8rem;
-                margin-top: 40px;
-                margin-bottom: 20px;
-                color: var(--primary-color);
-                border-bottom: 2px solid var(--border-color);
-                padding-bottom: 10px;
-            }}
-
-            .dashboard-section {{
-                background: rgba(10, 46, 54, 0.6);
-                border-radius: 16px;
-                box-shadow: 0 8px 32px rgba(0, 0, 0, 0.2);
-                backdrop-filter: blur(8px);
-                -webkit-backdrop-filter: blur(8px);
-                border: 1px solid var(--border-color);
-                padding: 25px;
-                margin-bottom: 30px;
-                position: relative;
-                overflow: hidden;
-            }}
-
-            .dashboard-section::before {{
-                content: '';
-                position: absolute;
-                top: 0;
-                left: 0;
-                width: 100%;
-                height: 4px;
-                background: linear-gradient(90deg, var(--primary-color), var(--secondary-color));
-            }}
-
-            .map-container {{
-                height: 600px;
-                margin-bottom: 25px;
-                border-radius: 12px;
-                overflow: hidden;
-                box-shadow: 0 8px 32px rgba(0, 0, 0, 0.2);
-                border: 1px solid var(--border-color);
-            }}
-
-            .tabs {{
-                display: flex;
-                border-bottom: 1px solid var(--border-color);
-                margin-bottom: 20px;
-            }}
-
-            .tab {{
-                padding: 10px 20px;
-                cursor: pointer;
-                border-bottom: 3px solid transparent;
-                transition: all 0.3s ease;
-            }}
-
-            .tab.active {{
-                border-bottom: 3px solid var(--primary-color);
-                font-weight: bold;
-            }}
-
-            .tab-content {{
-                display: none;
-            }}
-
-            .tab-content.active {{
-                display: block;
-            }}
-
-            .metrics-grid {{
-                display: grid;
-                grid-template-columns: repeat(auto-fill, minmax(250px, 1fr));
-                gap: 20px;
-                margin-bottom: 30px;
-            }}
-
-            .metric-card {{
-                background: linear-gradient(135deg, rgba(255, 255, 255, 0.05) 0%, rgba(255, 255, 255, 0.01) 100%);
-                border-radius: 12px;
-                box-shadow: 0 4px 15px rgba(0, 0, 0, 0.1);
-                padding: 20px;
-                text-align: center;
-                border: 1px solid var(--border-color);
-                transition: all 0.3s ease;
-            }}
-
-            .metric-card h3 {{
-                margin-top: 0;
-                color: var(--text-light);
-                font-size: 1rem;
-                font-weight: 500;
-                margin-bottom: 15px;
-            }}
-
-            .metric-value {{
-                font-size: 2.2rem;
-                font-weight: bold;
-                background: linear-gradient(90deg, var(--primary-color), var(--secondary-color));
-                -webkit-background-clip: text;
-                -webkit-text-fill-color: transparent;
-                margin: 10px 0;
-                line-height: 1;
-            }}
-
-            .metric-unit {{
-                font-size: 0.9rem;
-                color: rgba(255, 255, 255, 0.7);
-                margin-top: 5px;
-            }}
-
-            .viz-container {{
-                margin-top: 30px;
-                text-align: center;
-            }}
-
-            .viz-container img {{
-                max-width: 100%;
-                border-radius: 10px;
-                box-shadow: 0 5px 15px rgba(0, 0, 0, 0.2);
-            }}
-
-            iframe {{
-                width: 100%;
-                height: 600px;
-                border: none;
-                border-radius: 10px;
-            }}
-
-            footer {{
-                text-align: center;
-                margin-top: 50px;
-                padding: 20px;
-                border-top: 1px solid var(--border-color);
-                color: rgba(255, 255, 255, 0.7);
-            }}
-
-            @media (max-width: 768px) {{
-                .metrics-grid {{
-                    grid-template-columns: 1fr;
-                }}
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <header>
-                <h1>HPC Station Conversion Dashboard</h1>
-                <p>Interactive analysis of gas station viability for conversion to High-Power Charging stations</p>
-            </header>
-
-            <div class="dashboard-section">
-                <h2>Overview</h2>
-                <div class="metrics-grid">
-                    <div class="metric-card">
-                        <h3>Total Stations Analyzed</h3>
-                        <div class="metric-value">{len(df)}</div>
-                    </div>
-                    <div class="metric-card">
-                        <h3>Average Viability Score</h3>
-                        <div class="metric-value">{df['viability_score'].mean():.1f}</div>
-                        <div class="metric-unit">out of 100</div>
-                    </div>
-                    <div class="metric-card">
-                        <h3>Average ROI</h3>
-                        <div class="metric-value">{df['roi'].mean():.1f}%</div>
-                    </div>
-                    <div class="metric-card">
-                        <h3>Average Payback Period</h3>
-                        <div class="metric-value">{df[df['payback_period'] < 100]['payback_period'].mean():.1f}</div>
-                        <div class="metric-unit">years</div>
-                    </div>
-                </div>
-            </div>
-
-            <div class="dashboard-section">
-                <h2>Interactive Maps</h2>
-                <div class="tabs">
-                    <div class="tab active" onclick="showTab('station-map')">Station Viability Map</div>
-                    <div class="tab" onclick="showTab('traffic-map')">Traffic Heatmap</div>
-                </div>
-
-                <div id="station-map" class="tab-content active">
-                    <div class="map-container">
-                        <iframe src="station_map.html"></iframe>
-                    </div>
-                </div>
-
-                <div id="traffic-map" class="tab-content">
-                    <div class="map-container">
-                        <iframe src="traffic_map.html"></iframe>
-                    </div>
-                </div>
-            </div>
-
-            <div class="dashboard-section">
-                <h2>Data Analysis</h2>
-                <div class="viz-container">
-                    <img src="dashboard_visualizations.png" alt="Dashboard Visualizations">
-                </div>
-            </div>
-
-            <div class="dashboard-section">
-                <h2>EV Adoption Forecast</h2>
-                <div class="viz-container">
-                    <img src="ev_forecast.png" alt="EV Adoption Forecast">
-                </div>
-            </div>
-
-            <div class="dashboard-section">
-                <h2>Scenario Comparison</h2>
-                <div class="viz-container">
-                    <img src="scenario_comparison.png" alt="Scenario Comparison">
-                </div>
-
-                <div class="scenario-table">
-                    <h3>Scenario Details</h3>
-                    <table style="width: 100%; border-collapse: collapse; margin-top: 20px;">
-                        <thead>
-                            <tr style="background: rgba(255, 255, 255, 0.1);">
-                                <th style="padding: 10px; text-align: left; border-bottom: 1px solid var(--border-color);">Scenario</th>
-                                <th style="padding: 10px; text-align: right; border-bottom: 1px solid var(--border-color);">Avg ROI (%)</th>
-                                <th style="padding: 10px; text-align: right; border-bottom: 1px solid var(--border-color);">Avg Payback (years)</th>
-                                <th style="padding: 10px; text-align: right; border-bottom: 1px solid var(--border-color);">Total Investment ($M)</th>
-                                <th style="padding: 10px; text-align: right; border-bottom: 1px solid var(--border-color);">Viable Stations</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                            {{
-                                ''.join([
-                                    f'<tr style="border-bottom: 1px solid var(--border-color);">'
-                                    f'<td style="padding: 10px;">{index}</td>'
-                                    f'<td style="padding: 10px; text-align: right;">{row["avg_roi"]:.1f}%</td>'
-                                    f'<td style="padding: 10px; text-align: right;">{row["avg_payback"]:.1f}</td>'
-                                    f'<td style="padding: 10px; text-align: right;">${row["total_investment"]/1e6:.1f}M</td>'
-                                    f'<td style="padding: 10px; text-align: right;">{row["viable_stations"]}</td>'
-                                    f'</tr>'
-                                    for index, row in scenario_df.iterrows()
-                                ])
-                            }}
-                        </tbody>
-                    </table>
-                </div>
-            </div>
-
-            <footer>
-                <p>HPC Station Conversion Analysis Dashboard | Created for MLOps Project</p>
-            </footer>
-        </div>
+    """Create an HTML dashboard with all visualizations.
 
-        <script>
-            function showTab(tabId) {{
-                // Hide all tab contents
-                var tabContents = document.getElementsByClassName('tab-content');
-                for (var i = 0; i < tabContents.length; i++) {{
-                    tabContents[i].classList.remove('active');
-                }}
-
-                // Show the selected tab content
-                document.getElementById(tabId).classList.add('active');
-
-                // Update tab styles
-                var tabs = document.getElementsByClassName('tab');
-                for (var i = 0; i < tabs.length; i++) {{
-                    tabs[i].classList.remove('active');
-                }}
-
-                // Find the clicked tab and make it active
-                var clickedTab = event.target;
-                clickedTab.classList.add('active');
-            }}
-        </script>
-    </body>
-    </html>
+    The latest build is cached under .dashcache by a hash of df, so an
+    unchanged DataFrame returns the stored HTML without redrawing. Set
+    HPC_DASHBOARD_CLEAR_CACHE=1 to discard the cache and rebuild.
     """
-
-    # Save the HTML file
-    with open('hpc_dashboard.html', 'w') as f:
-        f.write(html_content)
+    if os.environ.get('HPC_DASHBOARD_CLEAR_CACHE', '').lower() in ('1', 'true', 'yes'):
+        shutil.rmtree(_DASH_CACHE_DIR, ignore_errors=True)
+
+    key = _dashboard_key(df)
+    cached_html = _cached_dashboard(key)
+    if cached_html is not None:
+        return cached_html
+
+    # Create visualizations, keeping only the PNG bytes to inline
+    _, dashboard_png = create_dashboard_visualizations(df)
+    _, forecast_png = create_ev_forecast()
+    _, scenario_df, scenario_png = create_scenario_comparison(df)
+
+    # Create a single map with the viability and traffic layers, rendered
+    # inline so the dashboard does not need a separate map file
+    map_html = create_combined_map(df).get_root().render()
+
+    # Overview metrics, each computed once
+    n_stations = len(df)
+    avg_viability = df['viability_score'].mean()
+    avg_roi = df['roi'].mean()
+    payback = df['payback_period']
+    avg_payback = payback[payback < 100].mean()
+
+    # Scenario table, formatted column by column and rendered by pandas
+    scenario_table = pd.DataFrame({
+        'Scenario': scenario_df.index,
+        'Avg ROI (%)': scenario_df['avg_roi'].map('{:.1f}%'.format).to_numpy(),
+        'Avg Payback (years)': scenario_df['avg_payback'].map('{:.1f}'.format).to_numpy(),
+        'Total Investment ($M)': (scenario_df['total_investment'] / 1e6).map('${:.1f}M'.format).to_numpy(),
+        'Viable Stations': scenario_df['viable_stations'].to_numpy()
+    }).to_html(classes='scenario-tbl', border=0, index=False)
+
+    # Render the page from the precompiled template
+    context = dict(
+        map_html=map_html,
+        dashboard_img=_embed_image(dashboard_png),
+        forecast_img=_embed_image(forecast_png),
+        scenario_img=_embed_image(scenario_png),
+        n_stations=n_stations,
+        avg_viability=avg_viability,
+        avg_roi=avg_roi,
+        avg_payback=avg_payback,
+        scenario_table=scenario_table
+    )
+    html_content = _minify_page(_DASHBOARD_TEMPLATE.render(css_file=_write_dashboard_css(), **context))
+
+    # Save the HTML file along with a gzipped copy
+    _write_with_gzip('hpc_dashboard.html', html_content)
+
+    # Package a copy with the stylesheet inlined as a single file for sharing
+    standalone = _minify_page(_DASHBOARD_TEMPLATE.render(inline_css=_DASHBOARD_CSS, **context))
+    with gzip.open('hpc_dashboard_standalone.html.gz', 'wb', compresslevel=9) as f:
+        f.write(standalone.encode('utf-8'))
+    print(f"Standalone dashboard: {len(standalone):,} bytes, "
+          f"{os.path.getsize('hpc_dashboard_standalone.html.gz'):,} bytes gzipped")
+
+    # Store the build and record which data the outputs on disk came from; only the
+    # build matching the current outputs can be reused, so older entries are dropped
+    shutil.rmtree(_DASH_CACHE_DIR, ignore_errors=True)
+    os.makedirs(_DASH_CACHE_DIR)
+    shutil.copyfile('hpc_dashboard.html', os.path.join(_DASH_CACHE_DIR, f"{key}.html"))
+    with open(os.path.join(_DASH_CACHE_DIR, 'current'), 'w') as f:
+        f.write(key)
 
     return html_content
 
+# Request handler that serves the dashboard files with cache headers
+class _DashboardRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Static file handler adding a strong ETag and a Cache-Control policy to each response."""
+
+    _etag = None
+
+    # ETags of files already hashed, keyed by (path, mtime_ns, size)
+    _etag_cache = {}
+
+    @classmethod
+    def _file_etag(cls, path):
+        """Return the ETag for path, hashing the file only when it has changed."""
+        # Content-hashed names already carry their hash
+        hashed = _HASHED_ASSET.search(path)
+        if hashed:
+            return f'"{hashed.group(1)}"'
+
+        st = os.stat(path)
+        key = (path, st.st_mtime_ns, st.st_size)
+        etag = cls._etag_cache.get(key)
+        if etag is None:
+            digest = hashlib.md5()
+            with open(path, 'rb') as f:
+                for chunk in iter(functools.partial(f.read, 1 << 20), b''):
+                    digest.update(chunk)
+            etag = f'"{digest.hexdigest()}"'
+            cls._etag_cache[key] = etag
+        return etag
+
+    def send_head(self):
+        self._etag = None
+        path = self.translate_path(self.path)
+        if os.path.isfile(path):
+            self._etag = self._file_etag(path)
+
+            # Answer revalidation with an empty 304 when the browser already has this version
+            if_none_match = self.headers.get('If-None-Match', '')
+            if self._etag in (tag.strip() for tag in if_none_match.split(',')):
+                self.send_response(304)
+                self.end_headers()
+                return None
+
+        return super().send_head()
+
+    def end_headers(self):
+        if self._etag:
+            self.send_header('ETag', self._etag)
+        # Hashed assets can be cached forever; the HTML shell is always revalidated
+        if _HASHED_ASSET.search(urlsplit(self.path).path):
+            self.send_header('Cache-Control', 'public, max-age=31536000, immutable')
+        else:
+            self.send_header('Cache-Control', 'no-cache')
+        super().end_headers()
+
+# Function to serve the dashboard over HTTP
+def serve_dashboard(port=8000, directory='.'):
+    """Serve the generated dashboard files from directory on the given port."""
+    handler = functools.partial(_DashboardRequestHandler, directory=directory)
+    with http.server.ThreadingHTTPServer(('', port), handler) as server:
+        print(f"Serving the dashboard at http://localhost:{port}/hpc_dashboard.html")
+        server.serve_forever()
+
 # Main function to run in Google Colab
 def run_hpc_dashboard():
     """Main function to run the HPC dashboard in Google Colab."""
     print("Generating gas station data...")
     df = generate_gas_station_data(n_stations=100)
 
-    print("Creating visualizations...")
-    create_dashboard_visualizations(df)
-    create_ev_forecast()
-    create_scenario_comparison(df)
-
-    print("Creating interactive maps...")
-    station_map = create_interactive_map(df)
-    traffic_map = create_traffic_heatmap(df)
-
-    # Save maps
-    station_map.save('station_map.html')
-    traffic_map.save('traffic_map.html')
-
-    print("Creating dashboard HTML...")
+    # The charts are drawn by create_dashboard_html, which inlines them
+    print("Creating visualizations, interactive map and dashboard HTML...")
     create_dashboard_html(df)
 
     print("Dashboard created successfully!")
@@ -5,36 +5,102 @@ A simplified script to generate visualizations for EV charging data filtered by
 """
 
 import os
+import hashlib
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import argparse
-import seaborn as sns
-import json
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from PIL import Image
+import orjson
 
 # Use non-interactive matplotlib backend
 import matplotlib
 matplotlib.use('Agg')
 
-# Set plotting style
-plt.style.use('seaborn-v0_8-whitegrid')
-sns.set_palette("viridis")
+# Plotting style is applied on first use by _init_style
+_STYLE_READY = False
+
+# Background PNG encoder, so compressing one chart overlaps drawing the next
+_PNG_WRITER = ThreadPoolExecutor(max_workers=2)
 
 # Constants
 OUTPUT_DIR = 'output/charging_patterns'
 DATA_PATH = 'data/ev_charging_patterns.csv'
 SAMPLE_PATH = 'data/ev_charging_patterns_sample.csv'
 
-# Custom JSON encoder to handle numpy types
-class NumpyEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, np.integer):
-            return int(obj)
-        elif isinstance(obj, np.floating):
-            return float(obj)
-        elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        return super(NumpyEncoder, self).default(obj)
+# Resolution and default subplot margins for the saved charts
+CHART_DPI = 150
+CHART_MARGINS = {'left': 0.08, 'right': 0.92, 'top': 0.9, 'bottom': 0.15}
+
+# orjson options for the analysis results (numpy scalars and integer keys are serialized natively)
+JSON_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# Columns the charts and analysis group sessions by
+GROUP_COLUMNS = ['Hour of Day', 'Day of Week', 'Time of Day', 'Charging Station ID',
+                 'Charger Type', 'User Type']
+
+# Integer grouping columns and their number of possible values
+CODE_RANGES = {'Hour of Day': 24, 'Day of Week': 7}
+
+# Columns read from the data file; anything else in the CSV is skipped
+LOAD_COLUMNS = ['Charging Start Time', 'Charging End Time', 'Charging Duration (hours)',
+                'Energy Consumed (kWh)', 'Charging Rate (kW)', 'Charging Station ID',
+                'Vehicle Model', 'Charger Type', 'User Type', 'User ID',
+                'Hour of Day', 'Day of Week', 'Month', 'Is Weekend', 'Time of Day',
+                'Location', 'City', 'Charging Station Location']
+DATE_COLUMNS = ['Charging Start Time', 'Charging End Time']
+
+# Low-cardinality text columns stored as pandas categoricals
+CATEGORY_COLUMNS = ['Charger Type', 'User Type', 'Vehicle Model', 'Charging Station ID']
+
+# Time of day categories, and the category code for each hour 0-23 (see categorize_time)
+TIME_OF_DAY_ORDER = ['Morning', 'Afternoon', 'Evening', 'Night']
+_TIME_OF_DAY_CODES = np.array([3] * 5 + [0] * 7 + [1] * 5 + [2] * 4 + [3] * 3, dtype=np.int8)
+
+
+def _init_style():
+    """Set the plotting style once, on the first chart"""
+    global _STYLE_READY
+    if _STYLE_READY:
+        return
+    
+    # Set plotting style; six viridis colors sampled away from the ends, as seaborn's palette did
+    plt.style.use('seaborn-v0_8-whitegrid')
+    plt.rcParams['axes.prop_cycle'] = plt.cycler(color=plt.get_cmap('viridis')(np.linspace(0, 1, 8)[1:-1]))
+    
+    # Let Agg simplify dense line paths and rasterize long ones in chunks
+    plt.rcParams['path.simplify'] = True
+    plt.rcParams['path.simplify_threshold'] = 1.0
+    plt.rcParams['agg.path.chunksize'] = 10000
+    _STYLE_READY = True
+
+
+def _write_png(rgba, path):
+    """Encode an RGBA pixel buffer to a PNG file"""
+    Image.fromarray(rgba).save(path, dpi=(CHART_DPI, CHART_DPI), optimize=False, compress_level=3)
+
+
+def save_chart(fig, path, **margins):
+    """Save a chart using fixed subplot margins instead of a tight_layout pass
+    
+    The figure is rasterized right away and the PNG is encoded on a background
+    thread, so the figure can be cleared or closed as soon as this returns.
+    
+    Args:
+        fig (matplotlib.figure.Figure): Figure to save
+        path (str): Output PNG path
+        **margins: Overrides for CHART_MARGINS (left, right, top, bottom)
+        
+    Returns:
+        concurrent.futures.Future: Completes once the file is written
+    """
+    fig.subplots_adjust(**{**CHART_MARGINS, **margins})
+    fig.set_dpi(CHART_DPI)
+    fig.canvas.draw()
+    rgba = np.asarray(fig.canvas.buffer_rgba()).copy()
+    return _PNG_WRITER.submit(_write_png, rgba, path)
 
 
 def ensure_output_dir():
@@ -56,26 +122,23 @@ def load_data(location=None):
     
     try:
         print(f"Loading data from {data_file}...")
-        df = pd.read_csv(data_file)
+        df = read_charging_csv(data_file)
         print(f"Loaded {len(df)} rows of data")
     except Exception as e:
         print(f"Error loading data: {e}")
         return create_synthetic_data()
     
     # Process data
-    # Convert timestamps if they exist
+    # Timestamps are parsed on read if they exist
     if 'Charging Start Time' in df.columns:
-        df['Charging Start Time'] = pd.to_datetime(df['Charging Start Time'])
-        df['Charging End Time'] = pd.to_datetime(df['Charging End Time'])
-        
         # Extract time features
         df['Hour of Day'] = df['Charging Start Time'].dt.hour
         df['Day of Week'] = df['Charging Start Time'].dt.dayofweek
         df['Month'] = df['Charging Start Time'].dt.month
-        df['Is Weekend'] = df['Day of Week'].isin([5, 6])
+        df['Is Weekend'] = df['Day of Week'].to_numpy() >= 5
         
         # Categorize time of day
-        df['Time of Day'] = df['Hour of Day'].apply(categorize_time)
+        df['Time of Day'] = categorize_hours(df['Hour of Day'])
     
     # Filter by location if specified
     if location:
@@ -84,11 +147,11 @@ def load_data(location=None):
         
         # Try different location fields that might exist in the data
         if 'Location' in df.columns:
-            df = df[df['Location'].str.contains(location, case=False, na=False)]
+            df = df[location_mask(df['Location'], location)]
         elif 'City' in df.columns:
-            df = df[df['City'].str.contains(location, case=False, na=False)]
+            df = df[location_mask(df['City'], location)]
         elif 'Charging Station Location' in df.columns:
-            df = df[df['Charging Station Location'].str.contains(location, case=False, na=False)]
+            df = df[location_mask(df['Charging Station Location'], location)]
         elif 'Charging Station ID' in df.columns and location.startswith('Station_'):
             df = df[df['Charging Station ID'] == location]
         
@@ -102,6 +165,68 @@ def load_data(location=None):
     return df
 
 
+def location_mask(values, location):
+    """Match rows whose location contains the given text, ignoring case
+    
+    The substring test runs once per distinct location rather than once per
+    row, and as a plain string search rather than a regex.
+    
+    Args:
+        values (pd.Series): Location column
+        location (str): Text to look for
+        
+    Returns:
+        pd.Series: Boolean mask aligned with values
+    """
+    distinct = pd.Series(values.dropna().unique())
+    matches = distinct[distinct.str.contains(location, case=False, regex=False)]
+    return values.isin(matches)
+
+
+def read_charging_csv(data_file):
+    """Read only the needed columns of a charging data CSV
+    
+    Uses pyarrow's multithreaded CSV reader when it is installed, and the
+    default C parser otherwise. The typed result is cached in a parquet file
+    next to the CSV and reused until the CSV is modified.
+    
+    Args:
+        data_file (str): Path to the CSV file
+        
+    Returns:
+        pd.DataFrame: Charging data with timestamps parsed and labels as categoricals
+    """
+    cache_file = data_file + '.parquet'
+    if os.path.exists(cache_file) and os.path.getmtime(cache_file) >= os.path.getmtime(data_file):
+        try:
+            return pd.read_parquet(cache_file)
+        except Exception as e:
+            print(f"Ignoring unreadable cache {cache_file}: {e}")
+    
+    # Only ask for the columns this file actually has
+    header = pd.read_csv(data_file, nrows=0).columns
+    usecols = [col for col in LOAD_COLUMNS if col in header]
+    parse_dates = [col for col in DATE_COLUMNS if col in usecols]
+    
+    try:
+        df = pd.read_csv(data_file, usecols=usecols, parse_dates=parse_dates, engine='pyarrow')
+    except ImportError:
+        df = pd.read_csv(data_file, usecols=usecols, parse_dates=parse_dates)
+    
+    # Store repeated labels as integer codes so grouping and counting avoid string hashing
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    
+    # Parquet keeps the dtypes and dictionary-encodes the categoricals
+    try:
+        df.to_parquet(cache_file, index=False)
+    except Exception as e:
+        print(f"Could not write cache {cache_file}: {e}")
+    
+    return df
+
+
 def categorize_time(hour):
     """Categorize hour into time of day
     
@@ -121,6 +246,25 @@ def categorize_time(hour):
         return 'Night'
 
 
+def categorize_hours(hours):
+    """Categorize a column of hours into time of day
+    
+    Vectorized equivalent of categorize_time using a per-hour lookup table.
+    Missing or out-of-range hours fall through to 'Night', as they do there.
+    
+    Args:
+        hours (pd.Series): Hour of day (0-23) for each row
+        
+    Returns:
+        pd.Categorical: Time of day category for each row, ordered as TIME_OF_DAY_ORDER
+    """
+    hours = hours.fillna(-1).to_numpy().astype(np.int64)
+    valid = (hours >= 0) & (hours < len(_TIME_OF_DAY_CODES))
+    codes = np.full(len(hours), TIME_OF_DAY_ORDER.index('Night'), dtype=np.int8)
+    codes[valid] = _TIME_OF_DAY_CODES[hours[valid]]
+    return pd.Categorical.from_codes(codes, categories=TIME_OF_DAY_ORDER)
+
+
 def create_synthetic_data(location=None):
     """Create synthetic data when real data is unavailable
     
@@ -151,8 +295,9 @@ def create_synthetic_data(location=None):
     # Create charging rate with some randomness
     charging_rate = energy / durations
     
-    # Create station IDs
-    station_ids = [f"Station_{i}" for i in np.random.randint(1, 50, n_points)]
+    # Create station IDs, as codes into the 49 possible names
+    station_ids = pd.Categorical.from_codes(np.random.randint(1, 50, n_points) - 1,
+                                            categories=[f"Station_{i}" for i in range(1, 50)])
     
     # Create vehicle models
     models = np.random.choice(
@@ -175,8 +320,9 @@ def create_synthetic_data(location=None):
         p=[0.4, 0.3, 0.2, 0.1]
     )
     
-    # Create user IDs
-    user_ids = [f"User_{i}" for i in np.random.randint(1, 200, n_points)]
+    # Create user IDs, as codes into the 199 possible names
+    user_ids = pd.Categorical.from_codes(np.random.randint(1, 200, n_points) - 1,
+                                         categories=[f"User_{i}" for i in range(1, 200)])
     
     # Create DataFrame
     df = pd.DataFrame({
@@ -197,35 +343,159 @@ def create_synthetic_data(location=None):
     df['Hour of Day'] = df['Charging Start Time'].dt.hour
     df['Day of Week'] = df['Charging Start Time'].dt.dayofweek
     df['Month'] = df['Charging Start Time'].dt.month
-    df['Is Weekend'] = df['Day of Week'].isin([5, 6])
-    df['Time of Day'] = df['Hour of Day'].apply(categorize_time)
+    df['Is Weekend'] = df['Day of Week'].to_numpy() >= 5
+    df['Time of Day'] = categorize_hours(df['Hour of Day'])
     
     return df
 
 
-def generate_time_visualizations(df, location):
-    """Generate time-based visualizations
+def location_labels(location):
+    """Format a location for chart titles and output filenames
+    
+    Args:
+        location (str): Location being analyzed
+        
+    Returns:
+        tuple: (title suffix such as " in New York", filename prefix such as "new_york_")
+    """
+    if not location:
+        return "", ""
+    return f" in {location}", f"{location.lower().replace(' ', '_')}_"
+
+
+def chart_key(df, location):
+    """Hash the data and location the charts are drawn from
     
     Args:
         df (pd.DataFrame): Charging data
         location (str): Location being analyzed
+        
+    Returns:
+        str: Hex digest identifying this set of charts
+    """
+    digest = hashlib.blake2b(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes(),
+                             digest_size=16)
+    digest.update(repr((location, CHART_DPI)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def cached_chart_paths(manifest_file, key):
+    """Return the chart paths recorded for key if they are all still on disk
+    
+    Args:
+        manifest_file (str): Manifest written after the last chart generation
+        key (str): Output of chart_key for the current data
+        
+    Returns:
+        list: Chart paths, or None if the charts need to be generated
+    """
+    if not os.path.exists(manifest_file):
+        return None
+    with open(manifest_file) as f:
+        lines = f.read().splitlines()
+    if not lines or lines[0] != key:
+        return None
+    paths = lines[1:]
+    if not all(os.path.exists(path) for path in paths):
+        return None
+    return paths
+
+
+def aggregate_by_codes(codes, labels, energy, name):
+    """Group energy by small non-negative integer codes with np.bincount
+    
+    Gives the same result as groupby(...).agg(sessions='size', energy_sum='sum',
+    energy_mean='mean') with observed=True, without building a hash table.
+    
+    Args:
+        codes (np.ndarray): Integer group code per row, -1 for missing
+        labels (list-like): Group label for each code
+        energy (np.ndarray): Energy consumed per row
+        name (str): Name for the resulting index
+        
+    Returns:
+        pd.DataFrame: 'sessions', 'energy_sum' and 'energy_mean' for each observed group
+    """
+    n_groups = len(labels)
+    known = codes >= 0
+    codes, energy = codes[known], energy[known]
+    has_energy = ~np.isnan(energy)
+    
+    sessions = np.bincount(codes, minlength=n_groups)
+    energy_sum = np.bincount(codes, weights=np.where(has_energy, energy, 0.0), minlength=n_groups)
+    energy_count = np.bincount(codes[has_energy], minlength=n_groups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        energy_mean = energy_sum / energy_count
+    
+    observed = sessions > 0
+    return pd.DataFrame(
+        {'sessions': sessions, 'energy_sum': energy_sum, 'energy_mean': energy_mean},
+        index=pd.Index(labels, name=name)
+    )[observed]
+
+
+def precompute_aggregates(df):
+    """Compute the per-group session counts and energy totals shared by the charts and analysis
+    
+    Each grouping column is scanned once here instead of once per chart. Hour
+    and day numbers and categorical columns are counted directly by their
+    integer codes; other columns go through a hashed groupby.
+    
+    Args:
+        df (pd.DataFrame): Charging data
+        
+    Returns:
+        dict: Grouping column -> DataFrame with 'sessions', 'energy_sum' and 'energy_mean' columns
+    """
+    energy = df['Energy Consumed (kWh)']
+    energy_values = energy.to_numpy(dtype=float)
+    aggregates = {}
+    for col in GROUP_COLUMNS:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            aggregates[col] = aggregate_by_codes(values.cat.codes.to_numpy(), values.cat.categories,
+                                                 energy_values, col)
+        elif (col in CODE_RANGES and values.dtype.kind in 'iu'
+              and 0 <= values.min() and values.max() < CODE_RANGES[col]):
+            aggregates[col] = aggregate_by_codes(values.to_numpy(), range(CODE_RANGES[col]),
+                                                 energy_values, col)
+        else:
+            aggregates[col] = energy.groupby(values, observed=True).agg(
+                sessions='size', energy_sum='sum', energy_mean='mean'
+            )
+    return aggregates
+
+
+def generate_time_visualizations(df, loc_title, loc_filename, aggregates=None):
+    """Generate time-based visualizations
+    
+    Args:
+        df (pd.DataFrame): Charging data
+        loc_title (str): Title suffix naming the location (see location_labels)
+        loc_filename (str): Filename prefix for the location (see location_labels)
+        aggregates (dict, optional): Output of precompute_aggregates(df)
     
     Returns:
         list: Paths to generated visualization files
     """
+    _init_style()
+    if aggregates is None:
+        aggregates = precompute_aggregates(df)
     paths = []
+    writes = []
     
-    # Format location string for titles and filenames
-    loc_title = f" in {location}" if location else ""
-    loc_filename = f"{location.lower().replace(' ', '_')}_" if location else ""
+    # One figure is reused for all three charts, cleared between them
+    fig = plt.figure(figsize=(12, 6))
     
     # 1. Hourly distribution
-    plt.figure(figsize=(12, 6))
-    hourly_counts = df.groupby('Hour of Day').size()
-    hourly_energy = df.groupby('Hour of Day')['Energy Consumed (kWh)'].sum()
-    
-    ax1 = plt.subplot(111)
-    ax1.bar(hourly_counts.index, hourly_counts.values, alpha=0.7, color='#3498db', label='Session Count')
+    # Pull the plotted columns out as arrays once
+    hourly = aggregates['Hour of Day']
+    hours = hourly.index.to_numpy()
+    hourly_counts = hourly['sessions'].to_numpy()
+    hourly_energy = hourly['energy_sum'].to_numpy()
+    
+    ax1 = fig.add_subplot(111)
+    ax1.bar(hours, hourly_counts, alpha=0.7, color='#3498db', label='Session Count')
     ax1.set_xlabel('Hour of Day', fontsize=12)
     ax1.set_ylabel('Number of Sessions', fontsize=12)
     ax1.set_title(f'EV Charging Sessions by Hour of Day{loc_title}', fontsize=14, fontweight='bold')
@@ -233,7 +503,7 @@ def generate_time_visualizations(df, location):
     ax1.grid(True, linestyle='--', alpha=0.7)
     
     ax2 = ax1.twinx()
-    ax2.plot(hourly_energy.index, hourly_energy.values, color='#e74c3c', marker='o', 
+    ax2.plot(hours, hourly_energy, color='#e74c3c', marker='o', 
              markersize=4, label='Energy Consumed (kWh)')
     ax2.set_ylabel('Total Energy Consumed (kWh)', fontsize=12)
     
@@ -242,30 +512,28 @@ def generate_time_visualizations(df, location):
     lines2, labels2 = ax2.get_legend_handles_labels()
     ax1.legend(lines + lines2, labels + labels2, loc='upper center')
     
-    plt.tight_layout()
     hourly_path = os.path.join(OUTPUT_DIR, f'{loc_filename}hourly_patterns.png')
-    plt.savefig(hourly_path, dpi=300)
-    plt.close()
+    writes.append(save_chart(fig, hourly_path))
     paths.append(hourly_path)
     
     # 2. Daily distribution
-    plt.figure(figsize=(12, 6))
+    fig.clear()
     day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    daily_counts = df.groupby('Day of Week').size()
-    daily_counts = daily_counts.reindex(range(7), fill_value=0)  # Ensure all days are included
-    daily_energy = df.groupby('Day of Week')['Energy Consumed (kWh)'].sum()
-    daily_energy = daily_energy.reindex(range(7), fill_value=0)  # Ensure all days are included
+    daily_counts = aggregates['Day of Week']['sessions']
+    daily_counts = daily_counts.reindex(range(7), fill_value=0).to_numpy()  # Ensure all days are included
+    daily_energy = aggregates['Day of Week']['energy_sum']
+    daily_energy = daily_energy.reindex(range(7), fill_value=0).to_numpy()  # Ensure all days are included
     
-    ax1 = plt.subplot(111)
-    ax1.bar(day_names, daily_counts.values, alpha=0.7, color='#3498db', label='Session Count')
+    ax1 = fig.add_subplot(111)
+    ax1.bar(day_names, daily_counts, alpha=0.7, color='#3498db', label='Session Count')
     ax1.set_xlabel('Day of Week', fontsize=12)
     ax1.set_ylabel('Number of Sessions', fontsize=12)
     ax1.set_title(f'EV Charging Sessions by Day of Week{loc_title}', fontsize=14, fontweight='bold')
-    plt.xticks(rotation=45)
+    ax1.tick_params(axis='x', rotation=45)
     ax1.grid(True, linestyle='--', alpha=0.7)
     
     ax2 = ax1.twinx()
-    ax2.plot(day_names, daily_energy.values, color='#e74c3c', marker='o', 
+    ax2.plot(day_names, daily_energy, color='#e74c3c', marker='o', 
              markersize=4, label='Energy Consumed (kWh)')
     ax2.set_ylabel('Total Energy Consumed (kWh)', fontsize=12)
     
@@ -274,29 +542,27 @@ def generate_time_visualizations(df, location):
     lines2, labels2 = ax2.get_legend_handles_labels()
     ax1.legend(lines + lines2, labels + labels2, loc='upper center')
     
-    plt.tight_layout()
     daily_path = os.path.join(OUTPUT_DIR, f'{loc_filename}daily_patterns.png')
-    plt.savefig(daily_path, dpi=300)
-    plt.close()
+    writes.append(save_chart(fig, daily_path, bottom=0.22))
     paths.append(daily_path)
     
     # 3. Time of day distribution
-    plt.figure(figsize=(10, 6))
-    time_of_day_order = ['Morning', 'Afternoon', 'Evening', 'Night']
-    time_counts = df.groupby('Time of Day').size()
-    time_counts = time_counts.reindex(time_of_day_order, fill_value=0)  # Ensure proper order
-    time_energy = df.groupby('Time of Day')['Energy Consumed (kWh)'].sum()
-    time_energy = time_energy.reindex(time_of_day_order, fill_value=0)  # Ensure proper order
-    
-    ax1 = plt.subplot(111)
-    ax1.bar(time_counts.index, time_counts.values, alpha=0.7, color='#3498db', label='Session Count')
+    fig.clear()
+    fig.set_size_inches(10, 6)
+    time_counts = aggregates['Time of Day']['sessions']
+    time_counts = time_counts.reindex(TIME_OF_DAY_ORDER, fill_value=0).to_numpy()  # Ensure proper order
+    time_energy = aggregates['Time of Day']['energy_sum']
+    time_energy = time_energy.reindex(TIME_OF_DAY_ORDER, fill_value=0).to_numpy()  # Ensure proper order
+    
+    ax1 = fig.add_subplot(111)
+    ax1.bar(TIME_OF_DAY_ORDER, time_counts, alpha=0.7, color='#3498db', label='Session Count')
     ax1.set_xlabel('Time of Day', fontsize=12)
     ax1.set_ylabel('Number of Sessions', fontsize=12)
     ax1.set_title(f'EV Charging Sessions by Time of Day{loc_title}', fontsize=14, fontweight='bold')
     ax1.grid(True, linestyle='--', alpha=0.7)
     
     ax2 = ax1.twinx()
-    ax2.plot(time_energy.index, time_energy.values, color='#e74c3c', marker='o', 
+    ax2.plot(TIME_OF_DAY_ORDER, time_energy, color='#e74c3c', marker='o', 
              markersize=4, label='Energy Consumed (kWh)')
     ax2.set_ylabel('Total Energy Consumed (kWh)', fontsize=12)
     
@@ -305,43 +571,49 @@ def generate_time_visualizations(df, location):
     lines2, labels2 = ax2.get_legend_handles_labels()
     ax1.legend(lines + lines2, labels + labels2, loc='upper center')
     
-    plt.tight_layout()
     time_of_day_path = os.path.join(OUTPUT_DIR, f'{loc_filename}time_of_day_patterns.png')
-    plt.savefig(time_of_day_path, dpi=300)
-    plt.close()
+    writes.append(save_chart(fig, time_of_day_path, left=0.1, right=0.9))
+    plt.close(fig)
     paths.append(time_of_day_path)
     
+    # Wait for the background PNG writes to finish
+    for write in writes:
+        write.result()
+    
     return paths
 
 
-def generate_station_visualizations(df, location):
+def generate_station_visualizations(df, loc_title, loc_filename, aggregates=None):
     """Generate station-based visualizations
     
     Args:
         df (pd.DataFrame): Charging data
-        location (str): Location being analyzed
+        loc_title (str): Title suffix naming the location (see location_labels)
+        loc_filename (str): Filename prefix for the location (see location_labels)
+        aggregates (dict, optional): Output of precompute_aggregates(df)
     
     Returns:
         list: Paths to generated visualization files
     """
+    _init_style()
+    if aggregates is None:
+        aggregates = precompute_aggregates(df)
     paths = []
-    
-    # Format location string for titles and filenames
-    loc_title = f" in {location}" if location else ""
-    loc_filename = f"{location.lower().replace(' ', '_')}_" if location else ""
+    writes = []
     
     # 1. Top stations by usage
     plt.figure(figsize=(12, 6))
-    station_counts = df.groupby('Charging Station ID').size().sort_values(ascending=False)
+    station_counts = aggregates['Charging Station ID']['sessions']
     
-    # Take top 10 stations
-    top_stations = station_counts.head(10)
+    # Take top 10 stations, selected without sorting every station
+    top_stations = station_counts.nlargest(10)
     
     # Create horizontal bar chart for better readability
-    plt.barh(top_stations.index, top_stations.values, color='#2ecc71')
+    top_counts = top_stations.to_numpy()
+    plt.barh(top_stations.index.to_numpy(), top_counts, color='#2ecc71')
     
     # Add count labels to the bars
-    for i, count in enumerate(top_stations.values):
+    for i, count in enumerate(top_counts):
         plt.text(count + 5, i, str(count), va='center')
     
     plt.xlabel('Number of Sessions', fontsize=12)
@@ -349,15 +621,14 @@ def generate_station_visualizations(df, location):
     plt.title(f'Top 10 Charging Stations by Usage{loc_title}', fontsize=14, fontweight='bold')
     plt.grid(axis='x', linestyle='--', alpha=0.7)
     
-    plt.tight_layout()
     top_stations_path = os.path.join(OUTPUT_DIR, f'{loc_filename}top_stations.png')
-    plt.savefig(top_stations_path, dpi=300)
+    writes.append(save_chart(plt.gcf(), top_stations_path, left=0.15))
     plt.close()
     paths.append(top_stations_path)
     
     # 2. Charger type distribution
     plt.figure(figsize=(10, 6))
-    charger_counts = df.groupby('Charger Type').size()
+    charger_counts = aggregates['Charger Type']['sessions']
     
     # Create pie chart
     plt.pie(charger_counts, labels=charger_counts.index, autopct='%1.1f%%', 
@@ -367,65 +638,72 @@ def generate_station_visualizations(df, location):
     plt.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
     plt.title(f'Distribution of Charging Sessions by Charger Type{loc_title}', fontsize=14, fontweight='bold')
     
-    plt.tight_layout()
     charger_type_path = os.path.join(OUTPUT_DIR, f'{loc_filename}charger_type_distribution.png')
-    plt.savefig(charger_type_path, dpi=300)
+    writes.append(save_chart(plt.gcf(), charger_type_path))
     plt.close()
     paths.append(charger_type_path)
     
+    # Wait for the background PNG writes to finish
+    for write in writes:
+        write.result()
+    
     return paths
 
 
-def generate_energy_visualizations(df, location):
+def generate_energy_visualizations(df, loc_title, loc_filename, aggregates=None):
     """Generate energy-based visualizations
     
     Args:
         df (pd.DataFrame): Charging data
-        location (str): Location being analyzed
+        loc_title (str): Title suffix naming the location (see location_labels)
+        loc_filename (str): Filename prefix for the location (see location_labels)
+        aggregates (dict, optional): Output of precompute_aggregates(df)
     
     Returns:
         list: Paths to generated visualization files
     """
+    _init_style()
+    if aggregates is None:
+        aggregates = precompute_aggregates(df)
     paths = []
-    
-    # Format location string for titles and filenames
-    loc_title = f" in {location}" if location else ""
-    loc_filename = f"{location.lower().replace(' ', '_')}_" if location else ""
+    writes = []
     
     # 1. Energy distribution
     plt.figure(figsize=(10, 6))
     
     # Create energy bins
-    energy_bins = [0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100, float('inf')]
+    energy_bins = np.array([0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100, np.inf])
     energy_labels = ['0-10', '10-20', '20-30', '30-40', '40-50', '50-60', 
                      '60-70', '70-80', '80-90', '90-100', '100+']
     
-    # Bin the energy values
-    energy_binned = pd.cut(df['Energy Consumed (kWh)'], bins=energy_bins, labels=energy_labels)
-    energy_counts = energy_binned.value_counts().sort_index()
+    # Count values per right-closed bin, (0, 10], (10, 20], ..., skipping non-positive and NaN
+    energy = df['Energy Consumed (kWh)'].to_numpy()
+    bin_index = np.searchsorted(energy_bins, energy[energy > 0], side='left') - 1
+    energy_counts = np.bincount(bin_index, minlength=len(energy_labels))
     
     # Plot the histogram
-    plt.bar(energy_counts.index, energy_counts.values, color='#1abc9c')
+    plt.bar(energy_labels, energy_counts, color='#1abc9c')
     plt.xlabel('Energy Consumed (kWh)', fontsize=12)
     plt.ylabel('Number of Sessions', fontsize=12)
     plt.title(f'Distribution of Energy Consumption per Session{loc_title}', fontsize=14, fontweight='bold')
     plt.xticks(rotation=45)
     plt.grid(axis='y', linestyle='--', alpha=0.7)
     
-    plt.tight_layout()
     energy_dist_path = os.path.join(OUTPUT_DIR, f'{loc_filename}energy_distribution.png')
-    plt.savefig(energy_dist_path, dpi=300)
+    writes.append(save_chart(plt.gcf(), energy_dist_path, left=0.1, bottom=0.2))
     plt.close()
     paths.append(energy_dist_path)
     
     # 2. Hourly energy consumption
     plt.figure(figsize=(10, 6))
     
-    hourly_energy = df.groupby('Hour of Day')['Energy Consumed (kWh)'].mean()
+    hourly_energy = aggregates['Hour of Day']['energy_mean']
+    hours = hourly_energy.index.to_numpy()
+    mean_energy = hourly_energy.to_numpy()
     
-    plt.plot(hourly_energy.index, hourly_energy.values, 
+    plt.plot(hours, mean_energy, 
              marker='o', markersize=6, color='#1abc9c', linewidth=2)
-    plt.fill_between(hourly_energy.index, hourly_energy.values, 
+    plt.fill_between(hours, mean_energy, 
                      alpha=0.3, color='#1abc9c')
     
     plt.xlabel('Hour of Day', fontsize=12)
@@ -434,36 +712,41 @@ def generate_energy_visualizations(df, location):
     plt.xticks(range(0, 24, 2))
     plt.grid(True, linestyle='--', alpha=0.7)
     
-    plt.tight_layout()
     hourly_energy_path = os.path.join(OUTPUT_DIR, f'{loc_filename}hourly_energy.png')
-    plt.savefig(hourly_energy_path, dpi=300)
+    writes.append(save_chart(plt.gcf(), hourly_energy_path, left=0.1))
     plt.close()
     paths.append(hourly_energy_path)
     
+    # Wait for the background PNG writes to finish
+    for write in writes:
+        write.result()
+    
     return paths
 
 
-def generate_user_visualizations(df, location):
+def generate_user_visualizations(df, loc_title, loc_filename, aggregates=None):
     """Generate user behavior visualizations
     
     Args:
         df (pd.DataFrame): Charging data
-        location (str): Location being analyzed
+        loc_title (str): Title suffix naming the location (see location_labels)
+        loc_filename (str): Filename prefix for the location (see location_labels)
+        aggregates (dict, optional): Output of precompute_aggregates(df)
     
     Returns:
         list: Paths to generated visualization files
     """
+    _init_style()
+    if aggregates is None:
+        aggregates = precompute_aggregates(df)
     paths = []
-    
-    # Format location string for titles and filenames
-    loc_title = f" in {location}" if location else ""
-    loc_filename = f"{location.lower().replace(' ', '_')}_" if location else ""
+    writes = []
     
     # 1. User segments by type
     plt.figure(figsize=(10, 6))
     
     # User type distribution
-    user_counts = df.groupby('User Type').size()
+    user_counts = aggregates['User Type']['sessions']
     
     # Create pie chart
     plt.pie(user_counts, labels=user_counts.index, autopct='%1.1f%%', 
@@ -473,25 +756,35 @@ def generate_user_visualizations(df, location):
     plt.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
     plt.title(f'Distribution of EV Charging Users by Type{loc_title}', fontsize=14, fontweight='bold')
     
-    plt.tight_layout()
     user_segments_path = os.path.join(OUTPUT_DIR, f'{loc_filename}user_segments.png')
-    plt.savefig(user_segments_path, dpi=300)
+    writes.append(save_chart(plt.gcf(), user_segments_path))
     plt.close()
     paths.append(user_segments_path)
     
+    # Wait for the background PNG writes to finish
+    for write in writes:
+        write.result()
+    
     return paths
 
 
-def analyze_data(df, location):
+def analyze_data(df, location, aggregates=None):
     """Analyze the charging data and return summary statistics
     
     Args:
         df (pd.DataFrame): Charging data
         location (str): Location being analyzed
+        aggregates (dict, optional): Output of precompute_aggregates(df)
         
     Returns:
         dict: Analysis results
     """
+    if aggregates is None:
+        aggregates = precompute_aggregates(df)
+    hourly_counts = aggregates['Hour of Day']['sessions']
+    daily_counts = aggregates['Day of Week']['sessions']
+    time_counts = aggregates['Time of Day']['sessions']
+    
     # Initialize results dictionary
     results = {}
     
@@ -508,26 +801,29 @@ def analyze_data(df, location):
     # Time pattern analysis
     results['time_patterns'] = {
         'hourly': {
-            'peak_hour': df.groupby('Hour of Day').size().idxmax(),
-            'distribution': df.groupby('Hour of Day').size().to_dict()
+            'peak_hour': hourly_counts.idxmax(),
+            'distribution': hourly_counts.to_dict()
         },
         'day_of_week': {
-            'peak_day': df.groupby('Day of Week').size().idxmax(),
-            'distribution': df.groupby('Day of Week').size().to_dict()
+            'peak_day': daily_counts.idxmax(),
+            'distribution': daily_counts.to_dict()
         },
         'time_of_day': {
-            'peak_period': df.groupby('Time of Day').size().idxmax(),
-            'distribution': df.groupby('Time of Day').size().to_dict()
+            'peak_period': time_counts.idxmax(),
+            'distribution': time_counts.to_dict()
         }
     }
     
     # Station utilization analysis
+    # Stations and charger types come straight from the shared group counts
+    station_counts = aggregates['Charging Station ID']['sessions']
+    charger_counts = aggregates['Charger Type']['sessions']
     results['station_utilization'] = {
-        'total_stations': df['Charging Station ID'].nunique(),
-        'top_stations': df.groupby('Charging Station ID').size().sort_values(ascending=False).head(10).to_dict(),
+        'total_stations': len(station_counts),
+        'top_stations': station_counts.nlargest(10).to_dict(),
         'charger_types': {
-            'distribution': df.groupby('Charger Type').size().to_dict(),
-            'most_common_type': df['Charger Type'].mode()[0] if len(df) > 0 else None
+            'distribution': charger_counts.to_dict(),
+            'most_common_type': charger_counts.idxmax() if len(df) > 0 else None
         }
     }
     
@@ -546,78 +842,125 @@ def analyze_data(df, location):
     }
     
     # User behavior analysis
+    n_users = df['User ID'].nunique()
+    user_type_counts = aggregates['User Type']['sessions']
     results['user_behavior'] = {
-        'total_users': df['User ID'].nunique(),
-        'avg_sessions_per_user': len(df) / df['User ID'].nunique() if df['User ID'].nunique() > 0 else 0,
+        'total_users': n_users,
+        'avg_sessions_per_user': len(df) / n_users if n_users > 0 else 0,
         'user_types': {
-            'distribution': df.groupby('User Type').size().to_dict(),
-            'most_common_type': df['User Type'].mode()[0] if len(df) > 0 else None
+            'distribution': user_type_counts.to_dict(),
+            'most_common_type': user_type_counts.idxmax() if len(df) > 0 else None
         }
     }
     
     return results
 
 
-def main():
-    """Main entry point for the script"""
-    # Set up argument parser
-    parser = argparse.ArgumentParser(
-        description='Generate EV charging pattern visualizations for a specific location',
-        formatter_class=argparse.RawTextHelpFormatter
-    )
-    
-    # Add command line arguments
-    parser.add_argument(
-        'location', 
-        type=str, 
-        help='Location to analyze (city name, region, or station ID)'
-    )
+def share_frame(df):
+    """Write a DataFrame to an uncompressed Arrow IPC file for worker processes
     
-    parser.add_argument(
-        '--verbose', 
-        action='store_true', 
-        help='Display detailed progress information'
-    )
+    Workers memory-map the file instead of receiving a pickled copy of the data.
     
-    # Parse arguments
-    args = parser.parse_args()
+    Args:
+        df (pd.DataFrame): Data to share
+        
+    Returns:
+        str: Path to the Arrow file, or None when pyarrow is not installed
+    """
+    try:
+        from pyarrow import feather
+    except ImportError:
+        return None
+    
+    fd, arrow_file = tempfile.mkstemp(suffix='.arrow')
+    os.close(fd)
+    feather.write_feather(df, arrow_file, compression='uncompressed')
+    return arrow_file
+
+
+def _generate_from_arrow(generate, arrow_file, loc_title, loc_filename, aggregates):
+    """Run a chart generator on data memory-mapped from an Arrow file (see share_frame)"""
+    from pyarrow import feather
+    df = feather.read_table(arrow_file, memory_map=True).to_pandas()
+    return generate(df, loc_title, loc_filename, aggregates)
+
+
+def run(location, verbose=False, parallel=True):
+    """Generate all visualizations and analysis results for a location
     
+    Args:
+        location (str): Location to analyze (city name, region, or station ID)
+        verbose (bool): Whether to print the detailed analysis summary
+        parallel (bool): Whether to draw the chart groups in worker processes;
+            callers that are already pool workers must pass False
+        
+    Returns:
+        int: Exit status (0 on success)
+    """
     # Ensure output directory exists
     ensure_output_dir()
     
     # Load and filter data by location
-    df = load_data(args.location)
-    
-    # Generate visualizations
-    print("Generating time pattern visualizations...")
-    time_paths = generate_time_visualizations(df, args.location)
+    df = load_data(location)
     
-    print("Generating station visualizations...")
-    station_paths = generate_station_visualizations(df, args.location)
+    # Group the sessions once for all charts and the analysis
+    aggregates = precompute_aggregates(df)
+    loc_title, loc_filename = location_labels(location)
     
-    print("Generating energy visualizations...")
-    energy_paths = generate_energy_visualizations(df, args.location)
+    # Skip chart generation when the charts on disk were drawn from the same data
+    key = chart_key(df, location)
+    manifest_file = os.path.join(OUTPUT_DIR, f'{loc_filename}manifest.txt')
+    all_paths = cached_chart_paths(manifest_file, key)
     
-    print("Generating user visualizations...")
-    user_paths = generate_user_visualizations(df, args.location)
-    
-    # Combine all paths
-    all_paths = time_paths + station_paths + energy_paths + user_paths
-    
-    # Analyze data
-    print("Analyzing data...")
-    analysis_results = analyze_data(df, args.location)
+    if all_paths is not None:
+        print("Visualizations are up to date, reusing existing files...")
+        print("Analyzing data...")
+        analysis_results = analyze_data(df, location, aggregates)
+    else:
+        generators = [generate_time_visualizations, generate_station_visualizations,
+                      generate_energy_visualizations, generate_user_visualizations]
+        print("Generating time pattern, station, energy and user visualizations...")
+        if parallel:
+            # One chart group per worker process, all reading one shared copy of the data
+            arrow_file = share_frame(df)
+            try:
+                with ProcessPoolExecutor(max_workers=len(generators)) as executor:
+                    if arrow_file is not None:
+                        futures = [executor.submit(_generate_from_arrow, generate, arrow_file,
+                                                   loc_title, loc_filename, aggregates)
+                                   for generate in generators]
+                    else:
+                        futures = [executor.submit(generate, df, loc_title, loc_filename, aggregates)
+                                   for generate in generators]
+                    
+                    # Analyze data while the charts render
+                    print("Analyzing data...")
+                    analysis_results = analyze_data(df, location, aggregates)
+                    
+                    # Combine all paths, in generator order
+                    all_paths = [path for future in futures for path in future.result()]
+            finally:
+                if arrow_file is not None:
+                    os.remove(arrow_file)
+        else:
+            all_paths = [path for generate in generators
+                         for path in generate(df, loc_title, loc_filename, aggregates)]
+            print("Analyzing data...")
+            analysis_results = analyze_data(df, location, aggregates)
+        
+        # Record which data the charts came from
+        with open(manifest_file, 'w') as f:
+            f.write('\n'.join([key] + all_paths))
     
     # Save analysis results to JSON
-    loc_filename = f"{args.location.lower().replace(' ', '_')}_" if args.location else ""
     results_file = os.path.join(OUTPUT_DIR, f'{loc_filename}analysis_results.json')
-    with open(results_file, 'w') as f:
-        json.dump(analysis_results, f, indent=4, cls=NumpyEncoder)
+    with open(results_file, 'wb') as f:
+        f.write(orjson.dumps(analysis_results, option=JSON_DUMP_OPTIONS))
     
     # Print summary
-    if args.verbose:
+    if verbose:
         print("\nAnalysis Results:")
-        print(f"Location: {args.location}")
+        print(f"Location: {location}")
         print(f"Total Sessions: {analysis_results['data_summary']['total_sessions']}")
         print(f"Peak Hour: {analysis_results['time_patterns']['hourly']['peak_hour']}:00")
         print(f"Peak Day: {analysis_results['time_patterns']['day_of_week']['peak_day']}")
@@ -636,6 +979,33 @@ def main():
     return 0
 
 
+def main():
+    """Main entry point for the script"""
+    # Set up argument parser
+    parser = argparse.ArgumentParser(
+        description='Generate EV charging pattern visualizations for a specific location',
+        formatter_class=argparse.RawTextHelpFormatter
+    )
+    
+    # Add command line arguments
+    parser.add_argument(
+        'location', 
+        type=str, 
+        help='Location to analyze (city name, region, or station ID)'
+    )
+    
+    parser.add_argument(
+        '--verbose', 
+        action='store_true', 
+        help='Display detailed progress information'
+    )
+    
+    # Parse arguments
+    args = parser.parse_args()
+    
+    return run(args.location, args.verbose)
+
+
 if __name__ == "__main__":
     import sys
     sys.exit(main()) 
\ No newline at end of file
@@ -4,21 +4,56 @@ This file loads environment variables from .env or provides defaults
 """
 
 import os
+import functools
+import types
 from dotenv import load_dotenv
 
-# Try to load .env file if it exists
-load_dotenv()
+# Names that used to be module-level constants, resolved lazily from get_config()
+_CONFIG_NAMES = {
+    "OPENAI_API_TYPE": "api_type",
+    "OPENAI_API_KEY": "api_key",
+    "OPENAI_API_BASE": "api_base",
+    "OPENAI_API_VERSION": "api_version",
+    "OPENAI_DEPLOYMENT_NAME": "deployment_name",
+    "OPENAI_API_ENDPOINT": "api_endpoint",
+}
 
-# OpenAI/Azure OpenAI Configuration
-OPENAI_API_TYPE = os.getenv("OPENAI_API_TYPE", "azure")
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "24046116ca6b413e8c8ba19e25c7f44d")
-OPENAI_API_BASE = os.getenv("OPENAI_API_BASE", "https://mx250220204441as.openai.azure.com/")
-OPENAI_API_VERSION = os.getenv("OPENAI_API_VERSION", "2025-01-01-preview")
-OPENAI_DEPLOYMENT_NAME = os.getenv("OPENAI_DEPLOYMENT_NAME", "gpt-4o-mlops-hpc")
+@functools.lru_cache(maxsize=1)
+def get_config():
+    """Load the OpenAI/Azure OpenAI settings once per process
 
-# Full URL for the deployment endpoint
-OPENAI_API_ENDPOINT = f"{OPENAI_API_BASE}openai/deployments/{OPENAI_DEPLOYMENT_NAME}/chat/completions?api-version={OPENAI_API_VERSION}"
+    The API key has no default and must come from the environment or .env.
+    """
+    # Try to load .env file if it exists
+    load_dotenv()
+
+    api_base = os.getenv("OPENAI_API_BASE", "https://mx250220204441as.openai.azure.com/")
+    api_version = os.getenv("OPENAI_API_VERSION", "2025-01-01-preview")
+    deployment_name = os.getenv("OPENAI_DEPLOYMENT_NAME", "gpt-4o-mlops-hpc")
+
+    return types.SimpleNamespace(
+        api_type=os.getenv("OPENAI_API_TYPE", "azure"),
+        api_key=os.getenv("OPENAI_API_KEY", ""),
+        api_base=api_base,
+        api_version=api_version,
+        deployment_name=deployment_name,
+        # Full URL for the deployment endpoint
+        api_endpoint=f"{api_base}openai/deployments/{deployment_name}/chat/completions?api-version={api_version}",
+    )
+
+def __getattr__(name):
+    """Keep `from openai_config import OPENAI_API_KEY` and friends working"""
+    if name in _CONFIG_NAMES:
+        return getattr(get_config(), _CONFIG_NAMES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def get_openai_api_key():
     """Get the OpenAI API key, checking environment variables first"""
-    return OPENAI_API_KEY 
\ No newline at end of file
+    return get_config().api_key
+
+def require_openai_api_key():
+    """Get the OpenAI API key, raising if it is not configured"""
+    api_key = get_openai_api_key()
+    if not api_key:
+        raise RuntimeError("OPENAI_API_KEY is not set; add it to the environment or to .env")
+    return api_key
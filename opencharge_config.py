@@ -2,24 +2,53 @@
 OpenChargeMap API Configuration
 
 This file contains the API key and configuration settings for OpenChargeMap integration.
+The API key is read from the OPENCHARGE_API_KEY environment variable or .env.
 """
 
-# OpenChargeMap API Key - Public for class project use
-OPENCHARGE_API_KEY = "b230774d-262e-4207-a003-c8576e82a454"
+import os
+import functools
+from dotenv import load_dotenv
 
 # API Endpoints
 OPENCHARGE_BASE_URL = "https://api.openchargemap.io/v3"
 OPENCHARGE_POI_ENDPOINT = f"{OPENCHARGE_BASE_URL}/poi"
 
-# Default query parameters
-DEFAULT_PARAMS = {
-    "key": OPENCHARGE_API_KEY,
+# Rate limiting settings
+RATE_LIMIT_REQUESTS = 100  # requests per day for free tier
+RATE_LIMIT_INTERVAL = 60   # seconds between requests recommended
+
+# Default query parameters, apart from the API key
+_QUERY_DEFAULTS = {
     "maxresults": 500,
     "compact": True,
     "verbose": False,
     "output": "json"
 }
 
-# Rate limiting settings
-RATE_LIMIT_REQUESTS = 100  # requests per day for free tier
-RATE_LIMIT_INTERVAL = 60   # seconds between requests recommended 
\ No newline at end of file
+@functools.lru_cache(maxsize=1)
+def get_opencharge_api_key():
+    """Load the OpenChargeMap API key once per process"""
+    # Try to load .env file if it exists
+    load_dotenv()
+    return os.getenv("OPENCHARGE_API_KEY", "")
+
+def require_opencharge_api_key():
+    """Return the OpenChargeMap API key, raising if it is not configured"""
+    api_key = get_opencharge_api_key()
+    if not api_key:
+        raise RuntimeError(
+            "OPENCHARGE_API_KEY is not set; add it to the environment or to .env"
+        )
+    return api_key
+
+def get_default_params():
+    """Default query parameters, including the API key (which must be set)"""
+    return {"key": require_opencharge_api_key(), **_QUERY_DEFAULTS}
+
+def __getattr__(name):
+    """Resolve the key-dependent settings on first use rather than at import"""
+    if name == "OPENCHARGE_API_KEY":
+        return get_opencharge_api_key()
+    if name == "DEFAULT_PARAMS":
+        return {"key": get_opencharge_api_key(), **_QUERY_DEFAULTS}
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
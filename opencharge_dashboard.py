@@ -6,23 +6,52 @@ This script creates interactive visualizations for charging station data from Op
 """
 
 import os
+from pathlib import Path
 import pandas as pd
 import numpy as np
 import folium
-from folium.plugins import MarkerCluster, HeatMap
+from folium.plugins import FastMarkerCluster, HeatMap
 import matplotlib.pyplot as plt
 import seaborn as sns
 import webbrowser
 
-from opencharge_integration import load_multiple_regions, fetch_charging_stations_batch
+from opencharge_integration import load_multiple_regions, fetch_charging_stations_batch, station_cache_exists
 
-def create_station_map(df, output_file="output/charging_stations_map.html"):
+# Power level thresholds (kW) and the marker color of each band between them
+POWER_THRESHOLDS = [22, 50, 150]
+POWER_COLORS = np.array(['green', 'blue', 'orange', 'red'])
+
+# Leaflet callback used by FastMarkerCluster; each row is [lat, lng, popup, tooltip, color]
+_MARKER_CALLBACK = """
+function (row) {
+    var icon = L.AwesomeMarkers.icon({markerColor: row[4], icon: 'info-sign', prefix: 'glyphicon'});
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    marker.bindPopup(row[2]);
+    marker.bindTooltip(row[3]);
+    return marker;
+}
+"""
+
+def map_center(df):
+    """
+    Compute the mean station position used to center the maps.
+    
+    Args:
+        df (pandas.DataFrame): DataFrame with charging station data
+        
+    Returns:
+        list: Center as [lat, lng]
+    """
+    return df[['latitude', 'longitude']].mean().tolist()
+
+def create_station_map(df, output_file="output/charging_stations_map.html", center=None):
     """
     Create an interactive map of charging stations.
     
     Args:
         df (pandas.DataFrame): DataFrame with charging station data
         output_file (str): Output HTML file path
+        center (array-like, optional): Map center as [lat, lng]; defaults to the station mean
         
     Returns:
         str: Path to output file
@@ -31,44 +60,39 @@ def create_station_map(df, output_file="output/charging_stations_map.html"):
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
     
     # Determine map center
-    center_lat = df['latitude'].mean()
-    center_lng = df['longitude'].mean()
+    if center is None:
+        center = map_center(df)
     
     # Create map
-    m = folium.Map(location=[center_lat, center_lng], zoom_start=5)
-    
-    # Create marker clusters
-    marker_cluster = MarkerCluster().add_to(m)
-    
-    # Define power level colors
-    def get_power_color(power_kw):
-        if power_kw >= 150:
-            return 'red'       # Ultra-fast charging
-        elif power_kw >= 50:
-            return 'orange'    # Fast charging
-        elif power_kw >= 22:
-            return 'blue'      # Standard charging
-        else:
-            return 'green'     # Slow charging
-    
-    # Add markers for each station
-    for _, row in df.iterrows():
-        popup_text = f"""
-        <b>{row['name']}</b><br>
-        Power: {row['power_kw']} kW<br>
-        Connectors: {row['connector_types']}<br>
-        Operator: {row['operator']}<br>
-        Access: {row['access_type']}<br>
-        Status: {row['status']}<br>
-        Address: {row['address']}, {row['city']}, {row['state']} {row['postcode']}<br>
-        """
-        
-        folium.Marker(
-            location=[row['latitude'], row['longitude']],
-            popup=popup_text,
-            tooltip=f"{row['name']} ({row['power_kw']} kW)",
-            icon=folium.Icon(color=get_power_color(row['power_kw']))
-        ).add_to(marker_cluster)
+    m = folium.Map(location=list(center), zoom_start=5)
+    
+    # Bucket power levels into colors: slow, standard, fast, ultra-fast
+    power_kw = df['power_kw'].fillna(0).to_numpy()
+    colors = POWER_COLORS[np.searchsorted(POWER_THRESHOLDS, power_kw, side='right')]
+    
+    # Build every popup and tooltip with column-wise string concatenation
+    text = df[['name', 'power_kw', 'connector_types', 'operator', 'access_type', 'status',
+               'address', 'city', 'state', 'postcode']].astype(str)
+    popups = (
+        "<b>" + text['name'] + "</b><br>"
+        + "Power: " + text['power_kw'] + " kW<br>"
+        + "Connectors: " + text['connector_types'] + "<br>"
+        + "Operator: " + text['operator'] + "<br>"
+        + "Access: " + text['access_type'] + "<br>"
+        + "Status: " + text['status'] + "<br>"
+        + "Address: " + text['address'] + ", " + text['city'] + ", " + text['state'] + " " + text['postcode'] + "<br>"
+    ).to_numpy()
+    tooltips = (text['name'] + " (" + text['power_kw'] + " kW)").to_numpy()
+    
+    # Build one row per station; markers are created client-side by _MARKER_CALLBACK
+    rows = df[['latitude', 'longitude']].itertuples(index=False, name=None)
+    marker_rows = [
+        [lat, lng, popup_text, tooltip, color]
+        for (lat, lng), popup_text, tooltip, color in zip(rows, popups, tooltips, colors)
+    ]
+    
+    # Add all markers in a single clustered layer
+    FastMarkerCluster(marker_rows, callback=_MARKER_CALLBACK).add_to(m)
     
     # Add legend
     legend_html = """
@@ -82,18 +106,19 @@ def create_station_map(df, output_file="output/charging_stations_map.html"):
     """
     m.get_root().html.add_child(folium.Element(legend_html))
     
-    # Save map
-    m.save(output_file)
+    # Save map, rendered in memory and written in one call
+    Path(output_file).write_text(m.get_root().render(), encoding='utf-8')
     
     return output_file
 
-def create_heatmap(df, output_file="output/charging_stations_heatmap.html"):
+def create_heatmap(df, output_file="output/charging_stations_heatmap.html", center=None):
     """
     Create a heatmap visualization of charging station density.
     
     Args:
         df (pandas.DataFrame): DataFrame with charging station data
         output_file (str): Output HTML file path
+        center (array-like, optional): Map center as [lat, lng]; defaults to the station mean
         
     Returns:
         str: Path to output file
@@ -102,20 +127,20 @@ def create_heatmap(df, output_file="output/charging_stations_heatmap.html"):
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
     
     # Determine map center
-    center_lat = df['latitude'].mean()
-    center_lng = df['longitude'].mean()
+    if center is None:
+        center = map_center(df)
     
     # Create map
-    m = folium.Map(location=[center_lat, center_lng], zoom_start=5)
+    m = folium.Map(location=list(center), zoom_start=5)
     
-    # Prepare heatmap data
-    heat_data = [[row['latitude'], row['longitude']] for _, row in df.iterrows()]
+    # Prepare heatmap data, skipping stations without coordinates
+    heat_data = df[['latitude', 'longitude']].dropna().to_numpy(dtype=np.float64).tolist()
     
     # Add heatmap layer
     HeatMap(heat_data, radius=15, blur=10).add_to(m)
     
-    # Save map
-    m.save(output_file)
+    # Save map, rendered in memory and written in one call
+    Path(output_file).write_text(m.get_root().render(), encoding='utf-8')
     
     return output_file
 
@@ -178,14 +203,11 @@ def create_connector_type_chart(df, output_file="output/connector_types.png"):
     # Create output directory if it doesn't exist
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
     
-    # Extract all connector types
-    all_connectors = []
-    for connectors in df['connector_types']:
-        if pd.notna(connectors):
-            all_connectors.extend([c.strip() for c in connectors.split(',')])
+    # Extract all connector types, one row per connector
+    all_connectors = df['connector_types'].dropna().str.split(',').explode().str.strip()
     
     # Count connector types
-    connector_counts = pd.Series(all_connectors).value_counts()
+    connector_counts = all_connectors.value_counts()
     
     # Keep only top 10 connector types
     if len(connector_counts) > 10:
@@ -319,7 +341,7 @@ def create_dashboard(output_dir="output"):
     """
     
     # Write HTML to file
-    with open(dashboard_file, 'w') as f:
+    with open(dashboard_file, 'w', buffering=1 << 20) as f:
         f.write(html_content)
     
     return dashboard_file
@@ -345,8 +367,8 @@ def main():
     
     all_exist = True
     for city in city_names:
-        file_path = f"{data_dir}/{city.lower().replace(' ', '_')}.csv"
-        if not os.path.exists(file_path):
+        file_path = f"{data_dir}/{city.lower().replace(' ', '_')}.parquet"
+        if not station_cache_exists(file_path):
             all_exist = False
             break
     
@@ -367,10 +389,13 @@ def main():
     # Create visualizations
     print("Creating visualizations...")
     
-    create_station_map(df)
+    # Both maps share one center
+    center = map_center(df)
+    
+    create_station_map(df, center=center)
     print("Created station map.")
     
-    create_heatmap(df)
+    create_heatmap(df, center=center)
     print("Created heatmap.")
     
     create_power_distribution_chart(df)
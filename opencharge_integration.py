@@ -8,6 +8,7 @@ This module provides functions to fetch and process data from the OpenChargeMap
 import os
 import json
 import time
+import ijson
 import pandas as pd
 import requests
 from tqdm import tqdm
@@ -15,10 +16,9 @@ import logging
 
 # Import configuration
 from opencharge_config import (
-    OPENCHARGE_API_KEY,
     OPENCHARGE_POI_ENDPOINT,
-    DEFAULT_PARAMS,
-    RATE_LIMIT_INTERVAL
+    RATE_LIMIT_INTERVAL,
+    get_default_params
 )
 
 # Set up logging
@@ -28,14 +28,58 @@ logging.basicConfig(
 )
 logger = logging.getLogger('opencharge_integration')
 
+def _legacy_csv_path(parquet_file):
+    """Path of the CSV cache that older versions wrote in place of parquet_file"""
+    return f"{os.path.splitext(parquet_file)[0]}.csv"
+
+def station_cache_exists(parquet_file):
+    """
+    Check whether processed station data is cached for a location.
+    
+    Args:
+        parquet_file (str): Path of the Parquet cache
+        
+    Returns:
+        bool: True if the Parquet cache or an older CSV cache exists
+    """
+    return os.path.exists(parquet_file) or os.path.exists(_legacy_csv_path(parquet_file))
+
+def read_station_cache(parquet_file):
+    """
+    Load cached station data, converting an older CSV cache to Parquet on first use.
+    
+    Args:
+        parquet_file (str): Path of the Parquet cache
+        
+    Returns:
+        pandas.DataFrame: Cached station data, or None if nothing is cached
+    """
+    if os.path.exists(parquet_file):
+        logger.info(f"Loading cached data from {parquet_file}")
+        return pd.read_parquet(parquet_file)
+    
+    csv_file = _legacy_csv_path(parquet_file)
+    if not os.path.exists(csv_file):
+        return None
+    
+    logger.info(f"Loading cached data from {csv_file}")
+    df = pd.read_csv(csv_file)
+    try:
+        df.to_parquet(parquet_file, index=False, compression='zstd')
+        logger.info(f"Converted cached data to {parquet_file}")
+    except Exception as e:
+        logger.warning(f"Could not write {parquet_file}: {str(e)}")
+    return df
+
 def fetch_charging_stations(
     country_code=None,
     latitude=None,
     longitude=None,
     distance=10,
     max_results=100,
-    output_file="data/charging_stations.csv",
-    cache=True
+    output_file="data/charging_stations.parquet",
+    cache=True,
+    export_csv=False
 ):
     """
     Fetch charging stations from OpenChargeMap API.
@@ -46,19 +90,24 @@ def fetch_charging_stations(
         longitude (float, optional): Center longitude for radius search
         distance (int, optional): Search radius in miles
         max_results (int, optional): Maximum number of results to return
-        output_file (str, optional): Path to save CSV output
+        output_file (str, optional): Path to save Parquet output
         cache (bool, optional): Whether to use cached data if available
+        export_csv (bool, optional): Also write a human-readable CSV copy
         
     Returns:
         pandas.DataFrame: DataFrame containing charging station data
+        
+    Raises:
+        RuntimeError: If data has to be fetched and OPENCHARGE_API_KEY is not set
     """
     # Check if cached data exists and is requested
-    if cache and os.path.exists(output_file):
-        logger.info(f"Loading cached data from {output_file}")
-        return pd.read_csv(output_file)
+    if cache:
+        df = read_station_cache(output_file)
+        if df is not None:
+            return df
     
-    # Build query parameters
-    params = DEFAULT_PARAMS.copy()
+    # Build query parameters; fails here, before any request, without an API key
+    params = get_default_params()
     params["maxresults"] = max_results
     
     if country_code:
@@ -72,30 +121,36 @@ def fetch_charging_stations(
     
     # Make API request
     logger.info(f"Fetching charging station data from OpenChargeMap API")
-    logger.info(f"API Key: {OPENCHARGE_API_KEY[:6]}...{OPENCHARGE_API_KEY[-4:]}")
+    logger.info(f"API Key: {params['key'][:6]}...{params['key'][-4:]}")
     logger.info(f"Parameters: {params}")
     
     try:
-        response = requests.get(OPENCHARGE_POI_ENDPOINT, params=params)
+        response = requests.get(OPENCHARGE_POI_ENDPOINT, params=params, stream=True)
         
         if response.status_code == 200:
-            data = response.json()
-            logger.info(f"Successfully fetched {len(data)} charging stations")
-            
             # Create folder for output if it doesn't exist
             os.makedirs(os.path.dirname(output_file), exist_ok=True)
             
-            # Save raw data
-            raw_output = output_file.replace('.csv', '_raw.json')
-            with open(raw_output, 'w') as f:
-                json.dump(data, f)
+            # Decode the POI array one station at a time, copying each to the
+            # raw dump (one JSON object per line) as it is processed
+            raw_output = f"{os.path.splitext(output_file)[0]}_raw.ndjson"
+            response.raw.decode_content = True
+            with response, open(raw_output, 'w') as f:
+                df = process_charging_stations(
+                    _tee_stations(ijson.items(response.raw, 'item', use_float=True), f)
+                )
+            logger.info(f"Successfully fetched {len(df)} charging stations")
             logger.info(f"Saved raw data to {raw_output}")
             
-            # Process and save to DataFrame
-            df = process_charging_stations(data)
-            df.to_csv(output_file, index=False)
+            # Save processed DataFrame
+            df.to_parquet(output_file, index=False, compression='zstd')
             logger.info(f"Saved processed data to {output_file}")
             
+            if export_csv:
+                csv_output = f"{os.path.splitext(output_file)[0]}.csv"
+                df.to_csv(csv_output, index=False)
+                logger.info(f"Exported CSV copy to {csv_output}")
+            
             return df
         else:
             logger.error(f"API request failed with status code {response.status_code}")
@@ -106,12 +161,34 @@ def fetch_charging_stations(
         logger.error(f"Error fetching charging station data: {str(e)}")
         return None
 
+def _tee_stations(stations, f):
+    """
+    Yield stations unchanged while writing each one to f as a JSON line.
+    
+    Args:
+        stations (iterable): Station objects as decoded from the API response
+        f (file): Text file receiving the newline-delimited JSON dump
+        
+    Returns:
+        generator: The same station objects
+    """
+    for station in stations:
+        f.write(json.dumps(station))
+        f.write('\n')
+        yield station
+
+# Columns of the processed station DataFrame, in record order
+STATION_COLUMNS = [
+    'id', 'name', 'latitude', 'longitude', 'address', 'city', 'state', 'postcode', 'country',
+    'power_kw', 'connector_types', 'access_type', 'operator', 'network', 'status'
+]
+
 def process_charging_stations(data):
     """
     Process raw charging station data from OpenChargeMap API.
     
     Args:
-        data (list): Raw data from OpenChargeMap API
+        data (iterable): Raw station objects from OpenChargeMap API
         
     Returns:
         pandas.DataFrame: Processed DataFrame
@@ -119,43 +196,38 @@ def process_charging_stations(data):
     records = []
     
     for station in data:
-        # Extract address info
-        address = station.get('AddressInfo', {})
+        # Look up each nested object once; the API may also send them as null
+        address = station.get('AddressInfo') or {}
+        operator = (station.get('OperatorInfo') or {}).get('Title', 'Unknown')
+        connections = station.get('Connections') or []
         
         # Extract connections information
-        connections = []
-        power_kw = 0
-        connector_types = []
-        
-        for conn in station.get('Connections', []):
-            if conn.get('PowerKW'):
-                power_kw = max(power_kw, conn.get('PowerKW', 0))
-            
-            if conn.get('ConnectionType', {}).get('Title'):
-                connector_types.append(conn.get('ConnectionType', {}).get('Title'))
-        
-        # Create record
-        record = {
-            'id': station.get('ID'),
-            'name': station.get('AddressInfo', {}).get('Title', 'Unknown'),
-            'latitude': address.get('Latitude'),
-            'longitude': address.get('Longitude'),
-            'address': address.get('AddressLine1', ''),
-            'city': address.get('Town', ''),
-            'state': address.get('StateOrProvince', ''),
-            'postcode': address.get('Postcode', ''),
-            'country': address.get('Country', {}).get('Title', ''),
-            'power_kw': power_kw,
-            'connector_types': ', '.join(set(connector_types)),
-            'access_type': station.get('UsageType', {}).get('Title', 'Unknown'),
-            'operator': station.get('OperatorInfo', {}).get('Title', 'Unknown'),
-            'network': station.get('OperatorInfo', {}).get('Title', 'Unknown'),
-            'status': station.get('StatusType', {}).get('Title', 'Unknown'),
+        power_kw = max((conn.get('PowerKW') or 0 for conn in connections), default=0)
+        connector_types = {
+            title for title in ((conn.get('ConnectionType') or {}).get('Title') for conn in connections)
+            if title
         }
         
-        records.append(record)
+        # Create record, in STATION_COLUMNS order
+        records.append((
+            station.get('ID'),
+            address.get('Title', 'Unknown'),
+            address.get('Latitude'),
+            address.get('Longitude'),
+            address.get('AddressLine1', ''),
+            address.get('Town', ''),
+            address.get('StateOrProvince', ''),
+            address.get('Postcode', ''),
+            (address.get('Country') or {}).get('Title', ''),
+            power_kw,
+            ', '.join(connector_types),
+            (station.get('UsageType') or {}).get('Title', 'Unknown'),
+            operator,
+            operator,
+            (station.get('StatusType') or {}).get('Title', 'Unknown'),
+        ))
     
-    return pd.DataFrame(records)
+    return pd.DataFrame.from_records(records, columns=STATION_COLUMNS)
 
 def fetch_charging_stations_batch(locations, output_dir="data/charging_stations"):
     """
@@ -178,7 +250,7 @@ def fetch_charging_stations_batch(locations, output_dir="data/charging_stations"
     
     for location in tqdm(locations, desc="Fetching charging stations"):
         name = location['name']
-        output_file = f"{output_dir}/{name.lower().replace(' ', '_')}.csv"
+        output_file = f"{output_dir}/{name.lower().replace(' ', '_')}.parquet"
         
         logger.info(f"Fetching data for {name}")
         
@@ -200,11 +272,11 @@ def fetch_charging_stations_batch(locations, output_dir="data/charging_stations"
 
 def load_multiple_regions(regions, data_dir="data/charging_stations"):
     """
-    Load data for multiple regions from CSV files.
+    Load data for multiple regions from cached Parquet (or older CSV) files.
     
     Args:
         regions (list): List of region names
-        data_dir (str): Directory containing CSV files
+        data_dir (str): Directory containing Parquet files
         
     Returns:
         pandas.DataFrame: Combined DataFrame with region column
@@ -212,9 +284,9 @@ def load_multiple_regions(regions, data_dir="data/charging_stations"):
     dfs = []
     
     for region in regions:
-        file_path = f"{data_dir}/{region.lower().replace(' ', '_')}.csv"
-        if os.path.exists(file_path):
-            df = pd.read_csv(file_path)
+        file_path = f"{data_dir}/{region.lower().replace(' ', '_')}.parquet"
+        df = read_station_cache(file_path)
+        if df is not None:
             df['region'] = region
             dfs.append(df)
         else:
@@ -194,22 +194,8 @@ try:
     df = hpc_dashboard.generate_gas_station_data(n_stations=50)
     print(f"Generated {len(df)} gas stations for analysis")
     
-    # Create visualizations
-    print("Creating dashboard visualizations...")
-    hpc_dashboard.create_dashboard_visualizations(df)
-    
-    # Create maps
-    print("Creating interactive maps...")
-    station_map = hpc_dashboard.create_interactive_map(df)
-    traffic_map = hpc_dashboard.create_traffic_heatmap(df)
-    
-    # Save maps as HTML
-    station_map.save('station_map.html')
-    traffic_map.save('traffic_map.html')
-    print("Saved interactive maps as HTML files")
-    
-    # Create the dashboard HTML
-    print("Creating dashboard HTML...")
+    # Create the dashboard HTML (the charts and combined map are rendered inline)
+    print("Creating dashboard visualizations, interactive map and dashboard HTML...")
     html_content = hpc_dashboard.create_dashboard_html(df)
     
     print("\n===== Dashboard Ready =====")
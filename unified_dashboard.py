@@ -21,7 +21,7 @@ import seaborn as sns
 import time
 
 # Import from existing modules
-from opencharge_integration import load_multiple_regions, fetch_charging_stations_batch
+from opencharge_integration import load_multiple_regions, fetch_charging_stations_batch, station_cache_exists
 
 # Create necessary folders
 folders = ['data', 'config', 'output']
@@ -49,8 +49,8 @@ def fetch_opencharge_data(force_refresh=False):
     
     all_exist = True
     for city in city_names:
-        file_path = f"{data_dir}/{city.lower().replace(' ', '_')}.csv"
-        if not os.path.exists(file_path) or force_refresh:
+        file_path = f"{data_dir}/{city.lower().replace(' ', '_')}.parquet"
+        if not station_cache_exists(file_path) or force_refresh:
             all_exist = False
             break
     